@@ -1,16 +1,463 @@
+"""
+data.csv를 읽어 기초 통계를 출력하고 chart.png로 선 그래프를 저장합니다.
+
+처음 읽을 때 컬럼 타입을 한 번 추론해 사이드카 파일(data.csv.schema.json)에
+저장하고, 이후에는 그 스키마의 명시적 dtype(카디널리티가 낮은 문자열 컬럼은
+category)과 필요한 컬럼만 읽어 타입 추론 비용과 메모리를 줄입니다.
+
+--chunksize를 주면 파일 전체를 메모리에 올리지 않고 청크 단위로 읽으면서
+count/mean/std/min/max를 병합하고, 사분위수는 병합 가능한 로그 버킷 스케치로
+근사해 describe()와 같은 형식의 요약을 출력합니다 (메모리보다 큰 파일용).
+
+Usage examples:
+  python analyze.py                       # data.csv 요약 + chart.png
+  python analyze.py --file big.csv --columns value
+  python analyze.py --refresh-schema      # 스키마 다시 추론
+  python analyze.py --bench               # 기본 read_csv와 로드 시간/메모리 비교
+  python analyze.py --file huge.csv --chunksize 1000000   # out-of-core 요약
+  python analyze.py test                  # 자체 테스트
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
-df = pd.read_csv("data.csv")
-print(df)
+SCHEMA_SUFFIX = ".schema.json"
+# string columns with at most this many distinct values (or at most this share
+# of the sampled rows) are stored as category
+CATEGORY_MAX_UNIQUE = 256
+CATEGORY_MAX_RATIO = 0.5
+# rows sampled when inferring the schema
+SCHEMA_SAMPLE_ROWS = 100_000
+# data.csv is written with a BOM on the first header
+ENCODING = "utf-8-sig"
+
+
+def schema_path_for(path):
+    return path + SCHEMA_SUFFIX
+
+
+def infer_schema(path, sample_rows=SCHEMA_SAMPLE_ROWS):
+    """Infer {column: dtype} from the first `sample_rows` rows of a CSV (all rows if None)."""
+    sample = pd.read_csv(path, encoding=ENCODING, nrows=sample_rows)
+    columns = {}
+    for name in sample.columns:
+        col = sample[name]
+        if pd.api.types.is_numeric_dtype(col) or pd.api.types.is_bool_dtype(col):
+            columns[name] = str(col.dtype)
+            continue
+        nunique = col.nunique(dropna=True)
+        if nunique <= CATEGORY_MAX_UNIQUE or nunique <= CATEGORY_MAX_RATIO * len(col):
+            columns[name] = "category"
+        else:
+            columns[name] = "str"
+    return {"encoding": ENCODING, "columns": columns}
+
+
+def load_schema(schema_path):
+    try:
+        with open(schema_path, encoding="utf-8") as fh:
+            schema = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(schema.get("columns"), dict):
+        return None
+    return schema
+
+
+def save_schema(schema, schema_path):
+    tmp = schema_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(schema, fh, ensure_ascii=False, indent=2)
+    os.replace(tmp, schema_path)
+
+
+def _widen(dtypes):
+    """Dtypes that also accept values the sample never showed: ints -> float64 (NaN), bool -> object."""
+    widened = {}
+    for name, dtype in dtypes.items():
+        if dtype.startswith(("int", "uint")):
+            dtype = "float64"
+        elif dtype == "bool":
+            dtype = "object"
+        widened[name] = dtype
+    return widened
+
+
+def read_header(path, encoding=ENCODING):
+    return list(pd.read_csv(path, encoding=encoding, nrows=0).columns)
+
+
+def load_data(path, columns=None, refresh_schema=False):
+    """
+    Read a CSV with the dtypes from its schema sidecar, inferring and saving it first if needed.
+
+    The sidecar is re-inferred when the file's header no longer matches it. If
+    the sampled dtypes don't fit the whole file (e.g. a NaN in an int column
+    after the sample), they are widened first and, failing that, inferred
+    from the full file; the schema that worked is saved.
+
+    Args:
+        path: CSV path.
+        columns: optional list of columns to read (others are never parsed).
+        refresh_schema: re-infer the schema even if a sidecar exists.
+    """
+    schema_path = schema_path_for(path)
+    schema = None if refresh_schema else load_schema(schema_path)
+    if schema is not None and list(schema["columns"]) != read_header(path, schema.get("encoding", ENCODING)):
+        schema = None  # columns were added, removed or renamed since the sidecar was written
+    if schema is None:
+        schema = infer_schema(path)
+        save_schema(schema, schema_path)
+
+    if columns:
+        missing = [c for c in columns if c not in schema["columns"]]
+        if missing:
+            raise ValueError(f"unknown column(s): {', '.join(missing)}")
+
+    def read(dtypes):
+        if columns:
+            dtypes = {c: dtypes[c] for c in columns}
+        return pd.read_csv(path, encoding=schema.get("encoding", ENCODING), usecols=list(dtypes), dtype=dtypes)
+
+    try:
+        return read(schema["columns"])
+    except (ValueError, TypeError):
+        pass
+    widened = _widen(schema["columns"])
+    if widened != schema["columns"]:
+        try:
+            df = read(widened)
+        except (ValueError, TypeError):
+            pass
+        else:
+            save_schema(dict(schema, columns=widened), schema_path)
+            return df
+    # the sample was not representative at all: infer from every row
+    schema = infer_schema(path, sample_rows=None)
+    save_schema(schema, schema_path)
+    return read(schema["columns"])
+
+
+class RunningStats:
+    """Mergeable count / mean / sum of squared deviations / min / max (Chan et al. update)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add_array(self, values):
+        if len(values) == 0:
+            return
+        other = RunningStats()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.merge(other)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self):
+        # sample standard deviation, like pandas (ddof=1)
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with logarithmic buckets (DDSketch-style).
+
+    Every returned quantile is within `relative_accuracy` of the value at that
+    rank; memory depends on the value range, not on the number of values.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        if not (0.0 < relative_accuracy < 1.0):
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _add_to_store(self, store, magnitudes):
+        keys, counts = np.unique(np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64), return_counts=True)
+        for k, c in zip(keys.tolist(), counts.tolist()):
+            store[k] = store.get(k, 0) + c
+
+    def add_array(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        tiny = np.finfo(float).tiny
+        pos = values[values > tiny]
+        neg = -values[values < -tiny]
+        if len(pos):
+            self._add_to_store(self.positive, pos)
+        if len(neg):
+            self._add_to_store(self.negative, neg)
+        self.zero_count += len(values) - len(pos) - len(neg)
+        self.count += len(values)
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("cannot merge sketches with different accuracy")
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for k, c in theirs.items():
+                mine[k] = mine.get(k, 0) + c
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def _values_at(self, ranks):
+        """Sketch values at the given sorted integer ranks (0-based)."""
+        buckets = [(-self._value(k), self.negative[k]) for k in sorted(self.negative, reverse=True)]
+        buckets.append((0.0, self.zero_count))
+        buckets += [(self._value(k), self.positive[k]) for k in sorted(self.positive)]
+        out = []
+        seen = 0
+        it = iter(buckets)
+        value, count = next(it)
+        for rank in ranks:
+            while seen + count <= rank:
+                seen += count
+                value, count = next(it)
+            out.append(value)
+        return out
+
+    def quantile(self, q):
+        """
+        Value at quantile q, interpolated linearly between the two nearest ranks like pandas/numpy.
+
+        Both neighbours are within `relative_accuracy` of the true values, so for
+        values of one sign the interpolated result is within that bound as well.
+        """
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        lo, hi = math.floor(rank), math.ceil(rank)
+        v_lo, v_hi = self._values_at([lo, hi])
+        return v_lo + (v_hi - v_lo) * (rank - lo)
+
+
+def describe_out_of_core(path, column="value", chunksize=1_000_000, relative_accuracy=0.01):
+    """
+    describe() for one numeric column of a CSV without loading the whole file.
+
+    The CSV is streamed in `chunksize` rows; count/mean/std/min/max are exact
+    (merged per chunk), the quartiles come from a QuantileSketch, interpolated
+    between ranks like describe(), and are within `relative_accuracy` of the exact
+    value (for a column whose values have one sign).
+    """
+    stats = RunningStats()
+    sketch = QuantileSketch(relative_accuracy)
+    reader = pd.read_csv(path, encoding=ENCODING, usecols=[column], dtype={column: "float64"}, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            values = chunk[column].to_numpy(dtype=float)
+            values = values[~np.isnan(values)]
+            stats.add_array(values)
+            sketch.add_array(values)
+
+    quartiles = [min(max(sketch.quantile(q), stats.min), stats.max) if stats.count else math.nan
+                 for q in (0.25, 0.5, 0.75)]
+    return pd.Series(
+        [float(stats.count), stats.mean if stats.count else math.nan, stats.std,
+         stats.min if stats.count else math.nan, *quartiles, stats.max if stats.count else math.nan],
+        index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"],
+        name=column,
+    )
+
+
+def _frame_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def benchmark(path, columns=None, repeat=5):
+    """Print best-of-`repeat` load time and memory of plain read_csv vs. load_data."""
+    def best(fn):
+        elapsed = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            df = fn()
+            elapsed = min(elapsed, time.perf_counter() - t0)
+        return elapsed, _frame_bytes(df)
+
+    load_data(path, columns)  # make sure the sidecar exists
+    rows = [
+        ("pd.read_csv (default)", best(lambda: pd.read_csv(path))),
+        ("load_data (schema)", best(lambda: load_data(path, columns))),
+    ]
+    print(f"file: {path} ({os.path.getsize(path)} bytes)")
+    for name, (sec, nbytes) in rows:
+        print(f"{name:24s} {sec * 1000:10.2f} ms {nbytes / 1e6:10.3f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV의 기초 통계를 출력하고 선 그래프를 저장합니다.")
+    parser.add_argument("--file", "-f", default="data.csv", help="읽을 CSV 파일 경로 (기본: data.csv)")
+    parser.add_argument("--columns", nargs="+", help="읽을 컬럼만 지정합니다 (기본: 전체)")
+    parser.add_argument("--refresh-schema", action="store_true", help="스키마 사이드카를 다시 추론합니다.")
+    parser.add_argument("--bench", action="store_true", help="기본 read_csv와 로드 시간/메모리를 비교합니다.")
+    parser.add_argument("--chunksize", type=int,
+                        help="지정하면 이 행 수씩 스트리밍하며 value 컬럼의 요약 통계만 출력합니다 (out-of-core).")
+    parser.add_argument("--accuracy", type=float, default=0.01,
+                        help="--chunksize 사분위수 근사의 상대 오차 (기본: 0.01)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.bench:
+            benchmark(args.file, args.columns)
+            return 0
+        if args.chunksize:
+            summary = describe_out_of_core(args.file, chunksize=args.chunksize, relative_accuracy=args.accuracy)
+            print("기초 통계 (out-of-core):")
+            print(summary)
+            return 0
+        df = load_data(args.file, args.columns, refresh_schema=args.refresh_schema)
+    except FileNotFoundError:
+        print(f"파일을 찾을 수 없습니다: {args.file}", file=sys.stderr)
+        return 2
+    except ValueError as ve:
+        print(f"Error: {ve}", file=sys.stderr)
+        return 3
+
+    print(df)
+
+    if "value" in df.columns:
+        print("\n기초 통계:")
+        print(df["value"].describe())
+
+    if "day" in df.columns and "value" in df.columns:
+        ax = df.plot(x="day", y="value", kind="line", marker="o", title="Values by Day")
+        fig = ax.get_figure()
+        fig.tight_layout()
+        fig.savefig("chart.png")
+        print("Saved chart.png")
+    return 0
+
+
+def test_load_data_schema():
+    import shutil
+    import tempfile
+
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, "big.csv")
+        n = SCHEMA_SAMPLE_ROWS + 5
+        pd.DataFrame({"id": np.arange(n), "kind": ["a", "b"] * (n // 2) + ["a"] * (n % 2),
+                      "value": np.arange(n) * 0.5}).to_csv(path, index=False)
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(",b,1.0\n")  # first NaN of the int column, after the sample
+
+        df = load_data(path)
+        assert len(df) == n + 1 and df["id"].isna().sum() == 1
+        assert load_schema(schema_path_for(path))["columns"]["id"] == "float64"  # widened and saved
+        assert str(df["kind"].dtype) == "category"
+
+        # a string after the sample in a float column: widening can't help, infer from every row
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write("7,a,abc\n")
+        df = load_data(path)
+        assert len(df) == n + 2 and not pd.api.types.is_float_dtype(df["value"])
+
+        # renamed / added columns are picked up instead of silently dropped
+        pd.read_csv(path).rename(columns={"value": "amount"}).assign(extra=1).to_csv(path, index=False)
+        df = load_data(path)
+        assert list(df.columns) == ["id", "kind", "amount", "extra"]
+        assert list(load_schema(schema_path_for(path))["columns"]) == list(df.columns)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_running_stats_merge():
+    rng = np.random.default_rng(1)
+    values = np.concatenate([rng.normal(1e6, 3.0, 5000), rng.normal(-20, 100, 3000), [0.0, 7.5]])
+    stats = RunningStats()
+    for chunk in np.array_split(values, 17):
+        stats.add_array(chunk)
+    empty = RunningStats()
+    stats.merge(empty)  # merging an empty part is a no-op
+    assert stats.count == len(values)
+    assert math.isclose(stats.mean, values.mean(), rel_tol=1e-12)
+    assert math.isclose(stats.std, values.std(ddof=1), rel_tol=1e-9)
+    assert stats.min == values.min() and stats.max == values.max()
+
+
+def test_quantile_sketch():
+    # small input: matches describe() (linear interpolation) within the accuracy
+    sketch = QuantileSketch(0.01)
+    sketch.add_array(np.array([1.0, 2.0, 3.0, 4.0]))
+    for q, exact in ((0.25, 1.75), (0.5, 2.5), (0.75, 3.25)):
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact, (q, sketch.quantile(q))
+
+    rng = np.random.default_rng(2)
+    for accuracy in (0.01, 0.05):
+        positive = rng.lognormal(3, 2, 20000)
+        mixed = np.concatenate([positive, -rng.lognormal(1, 1, 5000), np.zeros(100)])
+        for values in (positive, mixed):
+            merged = QuantileSketch(accuracy)
+            for chunk in np.array_split(values, 9):  # built from merged per-chunk sketches
+                part = QuantileSketch(accuracy)
+                part.add_array(chunk)
+                merged.merge(part)
+            ordered = np.sort(values)
+            for q in (0.0, 0.01, 0.25, 0.5, 0.75, 0.99, 1.0):
+                rank = q * (len(values) - 1)
+                lo, hi = ordered[math.floor(rank)], ordered[math.ceil(rank)]
+                frac = rank - math.floor(rank)
+                exact = lo + (hi - lo) * frac
+                bound = accuracy * (abs(lo) * (1 - frac) + abs(hi) * frac)
+                assert abs(merged.quantile(q) - exact) <= bound + 1e-12, (accuracy, q, merged.quantile(q), exact)
+
+
+def test_describe_out_of_core():
+    import tempfile
+
+    values = np.random.default_rng(3).gamma(2.0, 50.0, 10001)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "v.csv")
+        pd.DataFrame({"value": values}).to_csv(path, index=False)
+        got = describe_out_of_core(path, chunksize=1000)
+    expected = pd.Series(values).describe()
+    for key in ("count", "mean", "std", "min", "max"):
+        assert math.isclose(got[key], expected[key], rel_tol=1e-9), key
+    for key in ("25%", "50%", "75%"):
+        assert abs(got[key] - expected[key]) <= 0.01 * expected[key], key
 
-print("\n기초 통계:")
-print(df["value"].describe())
 
-ax = df.plot(x="day", y="value", kind="line", marker="o", title="Values by Day")
-fig = ax.get_figure()
-fig.tight_layout()
-fig.savefig("chart.png")
-print("Saved chart.png")
+def run_tests():
+    test_running_stats_merge()
+    test_quantile_sketch()
+    test_describe_out_of_core()
+    test_load_data_schema()
+    print("모든 테스트 통과")
 
 
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        run_tests()
+    else:
+        sys.exit(main())
@@ -1,14 +1,19 @@
 import csv
 import argparse
-from collections import defaultdict, OrderedDict
+import glob
+import itertools
 from datetime import datetime
 import sys
 import os
 
-try:
-    import matplotlib.pyplot as plt
-except Exception:
-    plt = None  # plotting optional
+import csv_scan
+import sales_io
+from sales_index import DailyIndex, GRAINS, source_stamp
+from lazy_imports import lazy_import, is_available
+from sales_records import SalesRecords
+
+# plotting optional; matplotlib is imported only when a plot is drawn
+plt = lazy_import("matplotlib.pyplot") if is_available("matplotlib") else None
 
 
 COMMON_DATE_FORMATS = [
@@ -40,66 +45,148 @@ def parse_amount(s: str):
     return float(s)
 
 
-def read_sales(path: str):
-    if not os.path.exists(path):
-        raise FileNotFoundError(path)
-    monthly = defaultdict(float)
-    with open(path, newline="", encoding="utf-8") as f:
+# cache marker for "not parsed yet" (None means "unparsable")
+_UNPARSED = object()
+
+
+def parse_dates_bulk(values):
+    """parse_date over many strings -> day ordinals (None for blank/bad dates); each distinct string is parsed once."""
+    cache = {}
+    out = []
+    for raw in values:
+        ordinal = cache.get(raw, _UNPARSED)
+        if ordinal is _UNPARSED:
+            ordinal = None
+            if raw.strip():
+                try:
+                    ordinal = parse_date(raw).toordinal()
+                except Exception:
+                    pass
+            cache[raw] = ordinal
+        out.append(ordinal)
+    return out
+
+
+def parse_amounts_bulk(values):
+    """parse_amount over many strings; unparsable amounts become 0.0."""
+    out = []
+    for raw in values:
+        try:
+            out.append(float(raw))  # fast path for plain numbers
+        except ValueError:
+            try:
+                out.append(parse_amount(raw))
+            except Exception:
+                out.append(0.0)
+    return out
+
+
+
+def _append_parsed(records, raw_dates, raw_amts):
+    ordinals = parse_dates_bulk(raw_dates)
+    amounts = parse_amounts_bulk(raw_amts)
+    if None in ordinals:
+        pairs = [(o, a) for o, a in zip(ordinals, amounts) if o is not None]
+        ordinals = [o for o, _ in pairs]
+        amounts = [a for _, a in pairs]
+    records.extend_arrays(ordinals, amounts)
+
+
+def _read_one_csv(path: str) -> SalesRecords:
+    records = SalesRecords()
+    with sales_io.open_text(path) as f:
         reader = csv.reader(f)
         # peek header row
         try:
             first = next(reader)
         except StopIteration:
-            return monthly
-        # detect header: if any non-numeric cell in first row -> header
-        has_header = any(not cell.replace(",", "").replace(".", "").strip().lstrip("+-").isdigit() for cell in first)
-        if has_header:
-            # use DictReader to get fieldnames
-            f.seek(0)
-            dreader = csv.DictReader(f)
-            fieldnames = [n.lower() for n in dreader.fieldnames or []]
-            # find date and amount columns
-            date_keys = [k for k in fieldnames if any(x in k for x in ("date", "day", "time"))]
-            amt_keys = [k for k in fieldnames if any(x in k for x in ("amount", "sales", "revenue", "value", "price", "total"))]
-            date_key = date_keys[0] if date_keys else dreader.fieldnames[0]
-            amt_key = amt_keys[0] if amt_keys else (dreader.fieldnames[1] if len(dreader.fieldnames) > 1 else dreader.fieldnames[0])
-            for row in dreader:
-                raw_date = row.get(date_key, "").strip()
-                raw_amt = row.get(amt_key, "").strip()
-                if not raw_date:
-                    continue
-                try:
-                    dt = parse_date(raw_date)
-                except Exception:
-                    # skip bad date
-                    continue
-                try:
-                    amt = parse_amount(raw_amt)
-                except Exception:
-                    amt = 0.0
-                key = f"{dt.year:04d}-{dt.month:02d}"
-                monthly[key] += amt
-        else:
-            # no header: assume two columns date, amount
-            # first row is data, process it and the rest
-            rows = [first] + list(reader)
-            for row in rows:
-                if len(row) < 1:
-                    continue
-                raw_date = row[0]
-                raw_amt = row[1] if len(row) > 1 else "0"
-                try:
-                    dt = parse_date(raw_date)
-                except Exception:
-                    continue
-                try:
-                    amt = parse_amount(raw_amt)
-                except Exception:
-                    amt = 0.0
-                key = f"{dt.year:04d}-{dt.month:02d}"
-                monthly[key] += amt
-    # return OrderedDict sorted by key (chronological)
-    return OrderedDict(sorted(monthly.items()))
+            return records
+        has_header, date_idx, amt_idx = csv_scan.detect_columns(first)
+        rows = reader if has_header else itertools.chain([first], reader)
+        # parse in batches so the bulk parsers can share their date cache
+        while True:
+            batch = list(itertools.islice(rows, 65536))
+            if not batch:
+                break
+            raw_dates = [row[date_idx] if date_idx is not None and date_idx < len(row) else "" for row in batch]
+            raw_amts = [row[amt_idx] if amt_idx is not None and amt_idx < len(row) else "" for row in batch]
+            _append_parsed(records, raw_dates, raw_amts)
+    return records
+
+
+def _read_one(path: str) -> SalesRecords:
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    if sales_io.is_compressed(path) or csv_scan.needs_csv_module(path):
+        return _read_one_csv(path)
+    # plain, unquoted file: mmap scanner, only the date/amount fields are decoded
+    has_header, date_idx, amt_idx = csv_scan.detect_columns(csv_scan.read_first_row(path))
+    records = SalesRecords()
+    for raw_dates, raw_amts in csv_scan.scan_columns(path, [date_idx, amt_idx], skip_first=has_header):
+        _append_parsed(records, raw_dates, raw_amts)
+    return records
+
+
+def _month_sums_one(path: str):
+    return _read_one(path).month_sums()
+
+
+def _inputs(path: str):
+    paths = sales_io.expand_inputs(path)
+    if not paths:
+        raise FileNotFoundError(path)
+    return paths
+
+
+def read_sales_records(path: str, workers=None) -> SalesRecords:
+    """
+    Read (date, amount) rows into SalesRecords; bad dates are skipped.
+
+    `path` may be a CSV, a glob or a directory of (.gz/.bz2/.xz/.zst) shards,
+    which are read in parallel with `workers` processes and concatenated in path order.
+    """
+    return sales_io.concat_records(sales_io.map_shards(_read_one, _inputs(path), workers))
+
+
+def read_sales(path: str, workers=None):
+    """Return OrderedDict[YYYY-MM] = summed amount (chronological); `path` as in read_sales_records."""
+    paths = _inputs(path)
+    if len(paths) == 1:
+        return _read_one(paths[0]).month_sums()
+    # only the per-shard monthly sums travel back from the workers
+    return sales_io.merge_month_sums(sales_io.map_shards(_month_sums_one, paths, workers))
+
+
+def load_index(path: str, index_path=None, workers=None, rebuild=False) -> DailyIndex:
+    """
+    Return a DailyIndex for the sales input `path`.
+
+    If `index_path` holds an index built from the same files (same size/mtime),
+    it is loaded instead of re-reading the CSVs; otherwise the index is built
+    and saved there.
+    """
+    paths = _inputs(path)
+    stamp = source_stamp(paths)
+    if index_path and not rebuild and os.path.exists(index_path):
+        try:
+            index = DailyIndex.load(index_path)
+        except (OSError, ValueError):
+            index = None
+        if index is not None and index.meta.get("source") == stamp:
+            return index
+    index = DailyIndex.from_records(read_sales_records(path, workers), meta={"source": stamp})
+    if index_path:
+        index.save(index_path)
+    return index
+
+
+def print_totals(title, totals):
+    if not totals:
+        print("데이터가 없습니다.")
+        return
+    print(title)
+    for k, v in totals.items():
+        print(f"{k}: {v:.2f}")
 
 
 def print_monthly(monthly):
@@ -112,6 +199,8 @@ def print_monthly(monthly):
 
 
 def plot_monthly(monthly, save_path=None):
+    if isinstance(monthly, SalesRecords):
+        monthly = monthly.month_sums()
     if plt is None:
         print("matplotlib이 설치되어 있지 않아 그래프를 그릴 수 없습니다.", file=sys.stderr)
         return
@@ -166,12 +255,28 @@ def generate_sample_csv(path: str, months: int = 6, rows_per_month: int = 4):
 
 def main():
     p = argparse.ArgumentParser(description="sales.csv를 읽어 월별 매출 합계를 출력합니다.")
-    p.add_argument("--file", "-f", default="sales.csv", help="읽을 CSV 파일 경로 (기본: sales.csv)")
+    p.add_argument("--file", "-f", default="sales.csv",
+                   help="읽을 CSV 파일 경로, glob 또는 디렉터리 (.gz/.bz2/.xz/.zst 가능, 기본: sales.csv)")
+    p.add_argument("--workers", "-w", type=int, help="여러 파일을 읽을 프로세스 수 (기본: CPU 수)")
     p.add_argument("--plot", action="store_true", help="그래프를 표시합니다 (matplotlib 필요)")
     p.add_argument("--save", "-s", help="그래프 이미지를 저장할 파일 경로 (예: out.png)")
     p.add_argument("--sample", action="store_true", help="CSV 파일이 없거나 --sample을 지정하면 샘플 파일을 생성합니다.")
+    p.add_argument("--index", help="일별 누적합 인덱스 파일 경로 (입력이 바뀌지 않았으면 재사용)")
+    p.add_argument("--rebuild-index", action="store_true", help="--index 파일을 무조건 다시 만듭니다.")
+    p.add_argument("--range", nargs=2, metavar=("START", "END"), help="[START, END) 기간의 매출 합계를 출력합니다.")
+    p.add_argument("--rollup", choices=GRAINS, help="day/week/month/quarter/year/fy 단위 합계를 출력합니다.")
+    p.add_argument("--fy-start", type=int, default=1, help="회계연도 시작 월 (--rollup fy, 기본: 1)")
+    p.add_argument("--buckets", nargs="+", metavar="DATE", help="주어진 경계 날짜로 나눈 구간별 합계를 출력합니다.")
+    p.add_argument("--serve", type=int, metavar="PORT",
+                   help="파일을 감시하며 월별 합계를 http://127.0.0.1:PORT/monthly 로 제공합니다 (JSON, ETag).")
+    p.add_argument("--interval", type=float, default=2.0, help="--serve 파일 확인 간격(초, 기본: 2)")
     args = p.parse_args()
 
+    if args.serve:
+        import sales_server
+        sales_server.serve(args.file, port=args.serve, interval=args.interval)
+        return
+
     # if sample requested or file missing -> create sample CSV and continue
     if args.sample:
         print(f"샘플 CSV를 생성합니다: {args.file}", file=sys.stderr)
@@ -180,7 +285,11 @@ def main():
         except Exception as e:
             print(f"샘플 생성 실패: {e}", file=sys.stderr)
             sys.exit(2)
-    elif not os.path.exists(args.file):
+    elif not os.path.exists(args.file) and sales_io.is_compressed(args.file):
+        # never write a plain-text sample under a .gz/.bz2/.xz/.zst name
+        print(f"파일을 찾을 수 없습니다: {args.file}", file=sys.stderr)
+        sys.exit(2)
+    elif not os.path.exists(args.file) and not glob.has_magic(args.file):
         print(f"파일을 찾을 수 없습니다: {args.file}\n샘플 CSV를 생성합니다.", file=sys.stderr)
         try:
             generate_sample_csv(args.file)
@@ -188,11 +297,33 @@ def main():
             print(f"샘플 생성 실패: {e}", file=sys.stderr)
             sys.exit(2)
 
+    if args.range or args.rollup or args.buckets:
+        try:
+            index = load_index(args.file, args.index, workers=args.workers, rebuild=args.rebuild_index)
+            if args.range:
+                start, end = (parse_date(x).date() for x in args.range)
+                print(f"{start} ~ {end} (미포함) 매출 합계: {index.total(start, end):.2f}")
+            if args.rollup:
+                print_totals(f"{args.rollup} 단위 매출 합계:", index.rollup(args.rollup, fy_start_month=args.fy_start))
+            if args.buckets:
+                edges = [parse_date(x).date() for x in args.buckets]
+                print_totals("구간별 매출 합계:", index.rollup(edges=edges))
+        except FileNotFoundError:
+            print(f"파일을 찾을 수 없습니다: {args.file}", file=sys.stderr)
+            sys.exit(2)
+        except ValueError as e:
+            print(f"오류: {e}", file=sys.stderr)
+            sys.exit(2)
+        return
+
     try:
-        monthly = read_sales(args.file)
+        monthly = read_sales(args.file, workers=args.workers)
     except FileNotFoundError:
         print(f"파일을 찾을 수 없습니다: {args.file}", file=sys.stderr)
         sys.exit(2)
+    except (OSError, EOFError) as e:  # e.g. a corrupt or mislabelled .gz shard
+        print(f"파일을 읽을 수 없습니다: {e}", file=sys.stderr)
+        sys.exit(2)
 
     print_monthly(monthly)
 
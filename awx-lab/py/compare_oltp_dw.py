@@ -1,11 +1,13 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 
-# CSV 파일 불러오기
-df_oltp = pd.read_csv('oltp_sales.csv')
-df_dw = pd.read_csv('dw_sales.csv')
+from sales_store import load_sales
 
-# 두 데이터프레임 병합 (Year, Month 기준)
+# 월별 매출 불러오기 (Parquet이 있으면 필요한 컬럼만, 없으면 CSV)
+df_oltp = load_sales('oltp_sales', columns=['Year', 'Month', 'SalesAmount'])
+df_dw = load_sales('dw_sales')
+
+# 두 데이터프레임 병합 (Year, Month 기준, 연-월 컬럼 YM은 DW 쪽 저장값 사용)
 df_merge = pd.merge(
     df_oltp, df_dw,
     on=['Year', 'Month'],
@@ -15,9 +17,6 @@ df_merge = pd.merge(
 # 매출 차이 계산
 df_merge['Diff'] = df_merge['SalesAmount_OLTP'] - df_merge['SalesAmount_DW']
 
-# 연-월 컬럼 생성
-df_merge['YM'] = df_merge['Year'].astype(str) + '-' + df_merge['Month'].astype(str).str.zfill(2)
-
 # 비교 시각화
 plt.figure(figsize=(12, 6))
 plt.plot(df_merge['YM'], df_merge['SalesAmount_OLTP'], marker='o', label='OLTP Sales')
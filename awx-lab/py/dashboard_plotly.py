@@ -1,11 +1,9 @@
-import pandas as pd
 import plotly.express as px
 
-# 1. 데이터 불러오기
-df = pd.read_csv('dw_sales.csv')
+from sales_api import load_monthly
 
-# 연-월 컬럼 생성
-df['YM'] = df['Year'].astype(str) + '-' + df['Month'].astype(str).str.zfill(2)
+# 1. 데이터 불러오기 (SALES_API_URL이 있으면 sales_server에서, 없으면 dw_sales.csv)
+df = load_monthly('dw_sales.csv')
 
 # 2. 그래프 생성
 fig = px.line(
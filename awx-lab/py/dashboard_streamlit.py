@@ -1,13 +1,22 @@
-import pandas as pd
+import os
+
 import plotly.express as px
 import streamlit as st
 
+from sales_api import MonthlyClient, load_monthly
+
 # 페이지 제목
 st.title("📊 DW 월별 매출 대시보드")
 
 # 1. 데이터 불러오기
-df = pd.read_csv('dw_sales.csv')
-df['YM'] = df['Year'].astype(str) + '-' + df['Month'].astype(str).str.zfill(2)
+# SALES_API_URL이 있으면 sales_server를 ETag로 폴링 (클라이언트는 재실행 간에 유지)
+@st.cache_resource
+def get_client(url):
+    return MonthlyClient(url)
+
+
+api_url = os.getenv("SALES_API_URL")
+df = load_monthly('dw_sales.csv', client=get_client(api_url) if api_url else None)
 
 # 2. 필터 UI
 years = df['Year'].unique()
@@ -1,14 +1,12 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score
 
-# 1. 데이터 불러오기 (DW 월별 매출)
-df = pd.read_csv('dw_sales.csv')
+from sales_store import load_sales
 
-# 연-월 컬럼 생성 (YYYY-MM)
-df['YM'] = df['Year'].astype(str) + '-' + df['Month'].astype(str).str.zfill(2)
+# 1. 데이터 불러오기 (DW 월별 매출, 연-월 컬럼 YM 포함)
+df = load_sales('dw_sales')
 
 # 월 번호 계산 (예: 첫 달 = 1, 그 다음 달 = 2, ...)
 df['MonthIndex'] = np.arange(1, len(df) + 1)
@@ -2,7 +2,6 @@ import os
 from dotenv import load_dotenv
 import pyodbc
 import pandas as pd
-import matplotlib.pyplot as plt
 
 # 1) 환경변수 로드
 load_dotenv()
@@ -41,7 +40,9 @@ with pyodbc.connect(conn_str) as conn:
     print("[INFO] 연결 성공:", who)
     df = pd.read_sql(sql, conn)
 
-# 6) 시각화
+# 6) 시각화 (matplotlib은 조회가 성공한 뒤에만 로드)
+import matplotlib.pyplot as plt
+
 plt.figure(figsize=(9, 4))
 df['YM'] = df['Year'].astype(str) + '-' + df['Month'].astype(str).str.zfill(2)
 plt.bar(df['YM'], df['SalesAmount'])
@@ -53,5 +54,7 @@ plt.tight_layout()
 plt.savefig('dw_monthly_sales.png', dpi=150)
 plt.show()
 
-# 7) CSV로 저장
-df.to_csv('dw_sales.csv', index=False, encoding='utf-8-sig')
+# 7) Parquet으로 저장 (dw_sales.parquet/Year=YYYY, YM 포함)
+from sales_store import write_sales_parquet
+
+write_sales_parquet(df, 'dw_sales')
@@ -2,7 +2,6 @@
 import os, urllib.parse
 from dotenv import load_dotenv, find_dotenv
 import pandas as pd
-import matplotlib.pyplot as plt
 from sqlalchemy import create_engine
 
 # 1) .env 로드
@@ -44,6 +43,9 @@ with engine.begin() as conn:
     print(who)
     df = pd.read_sql_query(sql, conn)
 
+# matplotlib은 조회가 성공한 뒤에만 로드
+import matplotlib.pyplot as plt
+
 plt.figure(figsize=(9, 4))
 df["YM"] = df["Year"].astype(str) + "-" + df["Month"].astype(str).str.zfill(2)
 plt.bar(df["YM"], df["SalesAmount"])
@@ -55,4 +57,6 @@ plt.tight_layout()
 plt.savefig("dw_monthly_sales.png", dpi=150)
 plt.show()
 
-df.to_csv("dw_sales.csv", index=False, encoding="utf-8-sig")
+from sales_store import write_sales_parquet
+
+write_sales_parquet(df, "oltp_sales")
@@ -2,7 +2,6 @@ import os
 from dotenv import load_dotenv
 import pyodbc
 import pandas as pd
-import matplotlib.pyplot as plt
 
 # .env 환경변수 불러오기
 load_dotenv()
@@ -44,7 +43,9 @@ print(df.head(10))
 top_products = df.groupby('Product')['TotalSales'].sum().nlargest(10).index
 df_top = df[df['Product'].isin(top_products)]
 
-# 시각화
+# 시각화 (matplotlib은 조회가 성공한 뒤에만 로드)
+import matplotlib.pyplot as plt
+
 plt.figure(figsize=(14, 6))
 for region in df_top['Region'].unique():
     subset = df_top[df_top['Region'] == region]
@@ -0,0 +1,63 @@
+"""
+대시보드용 월별 매출 로더.
+
+SALES_API_URL 환경변수가 있으면 sales_server.py의 /monthly 엔드포인트를
+ETag(If-None-Match)로 폴링해서, 데이터가 바뀌지 않았으면 304 응답만 받고
+이전 DataFrame을 그대로 씁니다. 없으면 sales_store.load_sales()로
+dw_sales.parquet(없으면 dw_sales.csv)을 읽습니다.
+
+query_dw.py는 이제 dw_sales.parquet/만 갱신하므로(dw_sales.csv는 더 이상
+쓰지 않음), 서버는 아래처럼 Parquet 데이터셋을 감시하도록 띄웁니다.
+
+  python ../../sales_server.py --file dw_sales.parquet --port 8765
+  set SALES_API_URL=http://127.0.0.1:8765/monthly
+"""
+import json
+import os
+import urllib.error
+import urllib.request
+
+import pandas as pd
+
+from sales_store import load_sales
+
+API_URL = os.getenv("SALES_API_URL")
+
+
+def _to_frame(payload):
+    rows = [(m["year"], m["month"], m["amount"], m["ym"]) for m in payload.get("months", [])]
+    return pd.DataFrame(rows, columns=["Year", "Month", "SalesAmount", "YM"])
+
+
+class MonthlyClient:
+    """ETag를 기억하는 /monthly 폴링 클라이언트"""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+        self.etag = None
+        self.df = None
+
+    def fetch(self):
+        headers = {"If-None-Match": self.etag} if self.etag and self.df is not None else {}
+        req = urllib.request.Request(self.url, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                payload = json.load(resp)
+                self.etag = resp.headers.get("ETag")
+        except urllib.error.HTTPError as e:
+            if e.code == 304:  # 변경 없음: 이전 결과 재사용
+                return self.df
+            raise
+        self.df = _to_frame(payload)
+        return self.df
+
+
+def load_monthly(csv_path="dw_sales.csv", client=None):
+    """Year, Month, SalesAmount, YM 컬럼의 월별 매출 DataFrame"""
+    if client is None and API_URL:
+        client = MonthlyClient(API_URL)
+    if client is not None:
+        return client.fetch()
+    name = csv_path[:-4] if csv_path.endswith(".csv") else csv_path
+    return load_sales(name)
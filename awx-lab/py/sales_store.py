@@ -0,0 +1,205 @@
+"""
+월별 매출 추출 결과(Year, Month, SalesAmount)를 Parquet으로 저장/로드합니다.
+
+query_dw.py / query_oltp.py는 결과를 <name>.parquet/ 디렉터리에 Year=YYYY hive
+파티션으로, 파티션 안은 Month 순으로 정렬해 zstd 압축과 컬럼 통계(min/max)를
+포함해 씁니다. 월별 집계는 한 달에 한 행뿐이라 Month까지 디렉터리로 나누면
+행마다 파일이 생기므로, Month 조건은 통계 기반 predicate pushdown으로
+처리합니다. 소비 스크립트(compare_oltp_dw.py, predict_sales.py, 대시보드)는
+load_sales()로 필요한 컬럼과 파티션만 읽고, YM 문자열은 저장된 값을 그대로 씁니다.
+Parquet이 없거나 pyarrow가 설치되어 있지 않으면 기존 <name>.csv를 읽습니다.
+
+저장할 때마다 <name>.parquet/v-<시각>/ 아래에 새 버전을 쓰고, 다 쓴 뒤에
+<name>.parquet/_CURRENT 포인터 파일을 os.replace로 바꿉니다. 읽는 쪽은 항상
+포인터가 가리키는 완성된 버전만 보며, 직전 버전은 읽는 중인 프로세스를 위해
+한 번 더 남겨 둡니다.
+
+  python sales_store.py convert dw_sales oltp_sales   # 기존 CSV를 Parquet으로 변환
+  python sales_store.py bench dw_sales                # CSV vs Parquet 로드 시간 비교
+"""
+import os
+import shutil
+import sys
+import time
+
+import pandas as pd
+
+COLUMNS = ["Year", "Month", "SalesAmount", "YM"]
+CURRENT_FILE = "_CURRENT"
+VERSION_PREFIX = "v-"
+PARTITION_COLUMNS = ["Year"]
+SORT_COLUMNS = ["Year", "Month"]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def _partitioning(pa):
+    return pa.dataset.partitioning(pa.schema([("Year", pa.int16())]), flavor="hive")
+
+
+def parquet_path(name):
+    return f"{name}.parquet"
+
+
+def current_version(root):
+    """Directory of the dataset version `root`/_CURRENT points to, or None if there is no dataset."""
+    try:
+        with open(os.path.join(root, CURRENT_FILE), encoding="utf-8") as fh:
+            version = fh.read().strip()
+    except FileNotFoundError:
+        return None
+    path = os.path.join(root, version)
+    return path if version and os.path.isdir(path) else None
+
+
+def _switch_version(root, version):
+    """Point root/_CURRENT at `version` atomically, then drop all but it and the previous version."""
+    previous = current_version(root)
+    pointer = os.path.join(root, CURRENT_FILE)
+    with open(pointer + ".tmp", "w", encoding="utf-8") as fh:
+        fh.write(version)
+    os.replace(pointer + ".tmp", pointer)
+    keep = {CURRENT_FILE, version, previous and os.path.basename(previous)}
+    for entry in os.listdir(root):
+        if entry not in keep:
+            path = os.path.join(root, entry)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+
+def add_ym(df):
+    df['YM'] = df['Year'].astype(str) + '-' + df['Month'].astype(str).str.zfill(2)
+    return df
+
+
+def write_sales_parquet(df, name, compression="zstd"):
+    """df(Year, Month, SalesAmount[, YM])를 <name>.parquet/Year= 파티션으로 저장"""
+    pa = _pyarrow()
+    if pa is None:
+        raise ImportError("Parquet 저장에는 pyarrow가 필요합니다 (pip install pyarrow)")
+    out = df[[c for c in COLUMNS if c in df.columns]].copy()
+    if 'YM' not in out.columns:
+        add_ym(out)
+    out = out.astype({'Year': 'int16', 'Month': 'int8', 'SalesAmount': 'float64'})
+    out['YM'] = out['YM'].astype('category')  # 사전 인코딩으로 저장
+    out = out.sort_values(SORT_COLUMNS, kind='stable')
+
+    root = parquet_path(name)
+    os.makedirs(root, exist_ok=True)
+    version = f"{VERSION_PREFIX}{time.time_ns()}"
+    tmp = os.path.join(root, version + ".tmp")
+    fmt = pa.dataset.ParquetFileFormat()
+    pa.dataset.write_dataset(
+        pa.Table.from_pandas(out, preserve_index=False),
+        tmp,
+        format=fmt,
+        partitioning=_partitioning(pa),
+        file_options=fmt.make_write_options(compression=compression, write_statistics=True),
+        basename_template="part-{i}.parquet",
+    )
+    # 새 버전을 다 쓴 뒤 포인터만 바꿔서, 읽는 쪽이 반쯤 쓴 데이터나 빈 디렉터리를 보지 않도록 함
+    os.rename(tmp, os.path.join(root, version))
+    _switch_version(root, version)
+    return root
+
+
+def load_sales(name, columns=None, years=None, months=None):
+    """
+    월별 매출 DataFrame을 (Year, Month) 순으로 반환합니다.
+
+    Args:
+        name: 'dw_sales', 'oltp_sales' 등 (<name>.parquet 또는 <name>.csv)
+        columns: 읽을 컬럼 (기본: Year, Month, SalesAmount, YM)
+        years: 지정하면 해당 연도 파티션만 읽음
+        months: 지정하면 해당 월(1-12)만 읽음 (Month 통계로 row group 단위 스킵)
+    """
+    columns = list(columns or COLUMNS)
+    pa = _pyarrow()
+    source = current_version(parquet_path(name)) if pa is not None else None
+    if source is not None:
+        dataset = pa.dataset.dataset(source, format="parquet", partitioning=_partitioning(pa))
+        filt = None
+        if years is not None:
+            filt = pa.dataset.field("Year").isin([int(y) for y in years])
+        if months is not None:
+            month_filt = pa.dataset.field("Month").isin([int(m) for m in months])
+            filt = month_filt if filt is None else filt & month_filt
+        read_cols = list(dict.fromkeys(columns + SORT_COLUMNS))
+        df = dataset.to_table(columns=read_cols, filter=filt).to_pandas()
+        if 'YM' in df.columns:
+            df['YM'] = df['YM'].astype(str)
+    else:
+        usecols = [c for c in columns if c != 'YM'] + [c for c in SORT_COLUMNS if c not in columns]
+        df = pd.read_csv(f"{name}.csv", usecols=usecols, encoding='utf-8-sig')
+        if years is not None:
+            df = df[df['Year'].isin([int(y) for y in years])]
+        if months is not None:
+            df = df[df['Month'].isin([int(m) for m in months])]
+        if 'YM' in columns:
+            add_ym(df)
+    df = df.astype({'Year': 'int64', 'Month': 'int64'})
+    df = df.sort_values(SORT_COLUMNS, kind='stable').reset_index(drop=True)
+    return df[columns]
+
+
+def convert(name):
+    df = pd.read_csv(f"{name}.csv", encoding='utf-8-sig')
+    root = write_sales_parquet(df, name)
+    print(f"{name}.csv -> {root} ({len(df)} rows)")
+
+
+def benchmark(name, repeat=20):
+    """CSV(YM 재생성 포함)와 Parquet(컬럼/파티션 프루닝) 로드 시간 비교"""
+    def best(fn):
+        elapsed = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            elapsed = min(elapsed, time.perf_counter() - t0)
+        return elapsed * 1000
+
+    def csv_load():
+        return add_ym(pd.read_csv(f"{name}.csv"))
+
+    pa = _pyarrow()
+    root = parquet_path(name)
+    if pa is None or current_version(root) is None:
+        print(f"{root}이 없습니다. 먼저 'python sales_store.py convert {name}'을 실행하세요.", file=sys.stderr)
+        return 2
+    years = sorted(load_sales(name, columns=['Year'])['Year'].unique())[-1:]
+    rows = [
+        ("CSV read_csv + YM", best(csv_load)),
+        ("Parquet all columns", best(lambda: load_sales(name))),
+        ("Parquet SalesAmount+YM", best(lambda: load_sales(name, columns=['SalesAmount', 'YM']))),
+        (f"Parquet year={years[0]}", best(lambda: load_sales(name, years=years))),
+    ]
+    for label, ms in rows:
+        print(f"{label:28s} {ms:8.2f} ms")
+    return 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2 or argv[0] not in ("convert", "bench"):
+        print(__doc__, file=sys.stderr)
+        return 2
+    for name in argv[1:]:
+        name = name[:-4] if name.endswith(".csv") else name
+        if argv[0] == "convert":
+            convert(name)
+        elif benchmark(name):
+            return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
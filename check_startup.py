@@ -0,0 +1,74 @@
+"""
+Guard cold-start time of the sales CLIs with `python -X importtime`.
+
+Each target command is run in a fresh interpreter; the per-module import times
+reported on stderr are summed, and the check fails if the total exceeds the
+budget or if a heavy library (matplotlib, pandas, ...) was imported on a path
+that never needs it.
+
+Usage examples:
+  python check_startup.py                    # default targets, 150 ms budget
+  python check_startup.py --budget-ms 80 --repeat 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (script, args) run from this directory; none of these paths plot or build DataFrames
+TARGETS = [
+    ("sales.py", ["--help"]),
+    ("sales.py", ["--file", "__missing__.csv"]),
+    ("analyze_sales.py", ["--help"]),
+]
+
+HEAVY_MODULES = ("matplotlib", "pandas", "numpy", "pyodbc", "sqlalchemy", "plotly")
+
+
+def import_profile(script, args):
+    """Run `script args` under -X importtime; return (total import us, set of imported top-level modules)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", script, *args],
+        cwd=HERE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    total_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        total_us += int(fields[0])
+        modules.add(fields[2].strip().split(".")[0])
+    return total_us, modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check cold-start import time of the sales CLIs.")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Max total import time per command (default: 150).")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command; the best is reported (default: 5).")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for script, script_args in TARGETS:
+        runs = [import_profile(script, script_args) for _ in range(max(1, args.repeat))]
+        best_us = min(us for us, _ in runs)
+        heavy = sorted(set().union(*(mods for _, mods in runs)) & set(HEAVY_MODULES))
+        ok = best_us <= args.budget_ms * 1000 and not heavy
+        failed |= not ok
+        cmd = " ".join([script, *script_args])
+        note = f"  heavy imports: {', '.join(heavy)}" if heavy else ""
+        print(f"{'OK  ' if ok else 'FAIL'} {cmd:40s} {best_us / 1000:8.1f} ms{note}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Memory-mapped scanner for simple (unquoted) CSV files.
+
+The csv module builds a list of str for every row even when only two columns
+are needed. For plain files without quote characters, scan_columns() mmaps the
+file, locates newline and delimiter offsets over the raw bytes (with NumPy when
+it is installed) and decodes only the requested fields, one window of the file
+at a time. Files containing quotes are left to the csv module
+(needs_csv_module()), since quoted fields may hide delimiters and newlines.
+
+Header detection is shared with analyze_sales via detect_columns(), so both
+paths pick the same date/amount columns.
+
+  python csv_scan.py test   # compares the scanner with the csv module readers
+"""
+import mmap
+
+from lazy_imports import lazy_import, is_available
+
+# NumPy is optional (pure-Python fallback below) and only imported on the first scan
+np = lazy_import("numpy") if is_available("numpy") else None
+
+# bytes scanned per step; the offset arrays for one window are the only
+# per-row temporaries, so memory stays bounded for any file size
+WINDOW = 8 << 20
+
+DATE_HINTS = ("date", "day", "time")
+AMOUNT_HINTS = ("amount", "sales", "revenue", "value", "price", "total")
+
+
+def detect_columns(first):
+    """
+    Decide from the first row whether the file has a header and where date/amount are.
+
+    Returns (has_header, date_idx, amount_idx). An index is None when the chosen
+    column can never be found in a row; read_sales matches header names
+    case-sensitively against the lower-cased hints, and that behaviour is kept.
+    """
+    # detect header: if any non-numeric cell in first row -> header
+    has_header = any(not cell.replace(",", "").replace(".", "").strip().lstrip("+-").isdigit() for cell in first)
+    if not has_header:
+        # no header: assume two columns date, amount
+        return False, 0, 1
+    fieldnames = [n.lower() for n in first]
+    date_keys = [k for k in fieldnames if any(x in k for x in DATE_HINTS)]
+    amt_keys = [k for k in fieldnames if any(x in k for x in AMOUNT_HINTS)]
+    date_key = date_keys[0] if date_keys else first[0]
+    amt_key = amt_keys[0] if amt_keys else (first[1] if len(first) > 1 else first[0])
+    date_idx = first.index(date_key) if date_key in first else None
+    amt_idx = first.index(amt_key) if amt_key in first else None
+    return True, date_idx, amt_idx
+
+
+def detect_month_columns(header):
+    """
+    Return (year_idx, month_idx, amount_idx) for Year / Month / amount tables
+    (awx-lab dw_sales.csv, sales_store Parquet datasets), else None.
+    """
+    lower = [c.lstrip("\ufeff").strip().lower() for c in header]
+    amt = [i for i, k in enumerate(lower) if any(x in k for x in AMOUNT_HINTS)]
+    if "year" in lower and "month" in lower and amt:
+        return lower.index("year"), lower.index("month"), amt[0]
+    return None
+
+
+def _open_map(fh):
+    try:
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:  # empty file
+        return None
+
+
+def needs_csv_module(path):
+    """True if the file has quote characters (or is empty) and must go through the csv module."""
+    with open(path, "rb") as fh:
+        mm = _open_map(fh)
+        if mm is None:
+            return True
+        with mm:
+            return mm.find(b'"') != -1
+
+
+def _window_fields_numpy(mm, lo, hi, columns, delimiter):
+    buf = np.frombuffer(mm, dtype=np.uint8, count=hi - lo, offset=lo)
+    newlines = np.flatnonzero(buf == 10)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(buf)]))
+    if starts[-1] >= len(buf):  # window ends with a newline: no trailing partial line
+        starts, ends = starts[:-1], ends[:-1]
+    delims = np.flatnonzero(buf == delimiter)
+    first = np.searchsorted(delims, starts)  # first delimiter at/after each line start
+    n_delims = np.searchsorted(delims, ends) - first  # delimiters inside each line
+
+    out = []
+    for k in columns:
+        if k is None:
+            out.append([""] * len(starts))
+            continue
+        exists = n_delims >= k
+        if len(delims):
+            f_start = starts if k == 0 else delims[np.clip(first + k - 1, 0, len(delims) - 1)] + 1
+            f_end = np.where(n_delims > k, delims[np.clip(first + k, 0, len(delims) - 1)], ends)
+        else:
+            f_start, f_end = starts, ends
+        # strip the \r of \r\n line endings from the last field of a line
+        cr = exists & (n_delims == k) & (f_end > f_start) & (buf[np.maximum(f_end - 1, 0)] == 13)
+        f_end = f_end - cr
+        f_start = np.where(exists, f_start, 0)
+        f_end = np.where(exists, f_end, 0)
+        out.append([mm[lo + s:lo + e].decode("utf-8") for s, e in zip(f_start.tolist(), f_end.tolist())])
+    return out
+
+
+def _window_fields_python(mm, lo, hi, columns, delimiter):
+    lines = mm[lo:hi].split(b"\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    need = max((k for k in columns if k is not None), default=0) + 1
+    sep = bytes([delimiter])
+    out = [[] for _ in columns]
+    for line in lines:
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        cells = line.split(sep, need)
+        for col, k in zip(out, columns):
+            col.append(cells[k].decode("utf-8") if k is not None and k < len(cells) else "")
+    return out
+
+
+def scan_columns(path, columns, skip_first=False, delimiter=",", window=WINDOW):
+    """
+    Yield, per window of the file, one list of decoded field strings per requested column.
+
+    Args:
+        path: unquoted CSV file (see needs_csv_module()).
+        columns: column indexes to extract; None yields "" for every row.
+        skip_first: skip the first line (header).
+        delimiter: single-byte field delimiter.
+        window: approximate bytes per step (windows always end on a newline).
+
+    Missing fields in short rows come back as "".
+    """
+    delim = ord(delimiter)
+    fields = _window_fields_numpy if np is not None else _window_fields_python
+    with open(path, "rb") as fh:
+        mm = _open_map(fh)
+        if mm is None:
+            return
+        with mm:
+            size = len(mm)
+            pos = 0
+            if skip_first:
+                nl = mm.find(b"\n")
+                pos = size if nl == -1 else nl + 1
+            while pos < size:
+                end = min(pos + window, size)
+                if end < size:
+                    nl = mm.find(b"\n", end)
+                    end = size if nl == -1 else nl + 1
+                yield fields(mm, pos, end, columns, delim)
+                pos = end
+
+
+def read_first_row(path, encoding="utf-8"):
+    """Return the first line split into cells (csv rules), or None for an empty file."""
+    import csv
+
+    with open(path, newline="", encoding=encoding) as fh:
+        try:
+            return next(csv.reader(fh))
+        except StopIteration:
+            return None
+
+
+def test_scan_matches_csv_reader():
+    import os
+    import tempfile
+
+    import analyze_sales
+    import sales
+    from sales_records import SalesRecords
+
+    def _outcome(read, path):
+        try:
+            return list(read(path))
+        except ValueError as e:
+            return str(e).split(": ", 1)[-1] if str(e).startswith(path) else str(e)
+
+    global np
+    rows = ["date,amount,note"]
+    for i in range(400):
+        rows.append(f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d},{i * 1.25:.2f},n{i}")
+        if i % 37 == 0:
+            rows.append("")  # blank line
+        if i % 41 == 0:
+            rows.append(f"2024-03-{i % 28 + 1:02d}")  # short row, no amount
+        if i % 53 == 0:
+            rows.append("not a date,5")
+    cases = {
+        "lf": "\n".join(rows) + "\n",
+        "crlf": "\r\n".join(rows) + "\r\n",
+        "no_final_newline": "\n".join(rows),
+        "no_header": "\n".join(r for r in rows[1:] if r) + "\n",
+        "amount_first": "\n".join(["amount,date"] + ["%s,2024-01-%02d" % (i, i % 28 + 1) for i in range(50)]),
+    }
+    saved_np = np
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, text in cases.items():
+            path = os.path.join(tmp, name + ".csv")
+            with open(path, "w", encoding="utf-8", newline="") as fh:
+                fh.write(text)
+            assert not needs_csv_module(path)
+            expected = analyze_sales._read_one_csv(path)
+            has_header, date_idx, amt_idx = detect_columns(read_first_row(path))
+            for use_numpy in (True, False):
+                if use_numpy and saved_np is None:
+                    continue
+                np = saved_np if use_numpy else None
+                try:
+                    for window in (1, 7, 64, WINDOW):
+                        got = SalesRecords()
+                        for raw_dates, raw_amts in scan_columns(path, [date_idx, amt_idx], has_header, window=window):
+                            analyze_sales._append_parsed(got, raw_dates, raw_amts)
+                        assert list(got) == list(expected), (name, use_numpy, window)
+                finally:
+                    np = saved_np
+            assert list(analyze_sales._read_one(path)) == list(expected), name
+            # sales.py: scanner fast path and strict csv reader agree (records or error)
+            assert _outcome(sales._read_one_csv, path) == _outcome(sales._read_records_csv, path), name
+        for name, text in {"strict_ok": "date,amount\r\n2024-01-02, 5 \r\n2024/01/03,1.5",
+                           "strict_bad": "date,amount\n2024-01-02,5\n\n2024-01-03,x\n"}.items():
+            path = os.path.join(tmp, name + ".csv")
+            with open(path, "w", encoding="utf-8", newline="") as fh:
+                fh.write(text)
+            assert sales._scan_records(path) is not None or name == "strict_bad"
+            assert _outcome(sales._read_one_csv, path) == _outcome(sales._read_records_csv, path), name
+
+        quoted = os.path.join(tmp, "quoted.csv")
+        with open(quoted, "w", encoding="utf-8") as fh:
+            fh.write('date,amount\n2024-01-01,"1,000"\n')
+        assert needs_csv_module(quoted)
+        empty = os.path.join(tmp, "empty.csv")
+        open(empty, "w").close()
+        assert needs_csv_module(empty) and list(scan_columns(empty, [0, 1])) == []
+
+
+def run_tests():
+    test_scan_matches_csv_reader()
+    print("모든 테스트 통과")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        run_tests()
+    else:
+        print(__doc__)
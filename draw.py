@@ -1,9 +1,13 @@
 import math
-from typing import Tuple, Optional
+import sys
+import time
+from typing import Tuple, Optional, Sequence, Union
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from matplotlib.collections import LineCollection
+from matplotlib.collections import LineCollection, EllipseCollection, PolyCollection
 from matplotlib import cm
+from matplotlib.colors import to_rgba_array
 
 
 def draw_circle(
@@ -148,7 +152,192 @@ def draw_rainbow_star(
     return fig
 
 
+def _batch_arrays(centers, radii, colors):
+    """Normalize batch inputs to (N, 2) centers, (N,) radii and a color list/array."""
+    xy = np.asarray(centers, dtype=float).reshape(-1, 2)
+    n = len(xy)
+    r = np.broadcast_to(np.asarray(radii, dtype=float), (n,))
+    if n and np.any(r <= 0):
+        raise ValueError("radius must be greater than 0")
+    if colors is None:
+        colors = cm.rainbow(np.linspace(0.0, 1.0, n)) if n else "black"
+    return xy, r, colors
+
+
+def _batch_figure(xy, r, margin_ratio, figsize, bgcolor):
+    fig, ax = plt.subplots(figsize=figsize)
+    fig.patch.set_facecolor(bgcolor)
+    ax.set_aspect("equal")
+    ax.set_facecolor(bgcolor)
+    if len(xy):
+        margin = max(margin_ratio * float(r.max()), 0.1)
+        ax.set_xlim(float((xy[:, 0] - r).min()) - margin, float((xy[:, 0] + r).max()) + margin)
+        ax.set_ylim(float((xy[:, 1] - r).min()) - margin, float((xy[:, 1] + r).max()) + margin)
+    ax.axis("off")
+    return fig, ax
+
+
+def _finish_batch(fig, save, dpi):
+    """Save a batch figure (format from the file extension, e.g. .png/.svg) and close it."""
+    try:
+        if save:
+            fig.savefig(save, dpi=dpi, bbox_inches="tight", facecolor=fig.get_facecolor())
+    finally:
+        plt.close(fig)
+
+
+def draw_circles(
+    centers: Sequence[Tuple[float, float]],
+    radii: Union[float, Sequence[float]],
+    colors=None,
+    fill: bool = False,
+    linewidth: float = 1.0,
+    figsize: Tuple[float, float] = (8, 8),
+    save: Optional[str] = None,
+    dpi: Optional[float] = None,
+    bgcolor: str = "white",
+) -> None:
+    """
+    Draw many circles into one figure with a single EllipseCollection.
+
+    Unlike draw_circle, no per-shape Patch objects are created, so the cost per
+    circle is a few array slots instead of a full artist. The figure is rendered
+    headless and closed afterwards.
+
+    Args:
+        centers: sequence (or (N, 2) array) of (x, y) centers.
+        radii: one radius for all circles or one radius per circle (> 0).
+        colors: one color, or one color per circle (default: rainbow gradient).
+        fill: whether to fill the circles.
+        linewidth: edge line width.
+        figsize, save, bgcolor: same semantics as draw_circle.
+        dpi: output resolution (default: matplotlib's savefig.dpi).
+    """
+    xy, r, colors = _batch_arrays(centers, radii, colors)
+    fig, ax = _batch_figure(xy, r, 0.1, figsize, bgcolor)
+
+    if len(xy):
+        diameters = 2 * r
+        ec = EllipseCollection(
+            diameters,
+            diameters,
+            np.zeros_like(r),
+            units="xy",
+            offsets=xy,
+            offset_transform=ax.transData,
+            edgecolors=colors,
+            facecolors=colors if fill else "none",
+            linewidths=linewidth,
+        )
+        ax.add_collection(ec)
+
+    _finish_batch(fig, save, dpi)
+
+
+def _star_vertices_batch(xy: np.ndarray, r: np.ndarray, inner_radius_ratio: float, points: int) -> np.ndarray:
+    """Vectorized _star_vertices: return an (N, 2 * points, 2) vertex array."""
+    angles = math.pi / 2 + np.arange(2 * points) * (math.pi / points)
+    scale = np.where(np.arange(2 * points) % 2 == 0, 1.0, inner_radius_ratio)
+    unit = np.stack([np.cos(angles) * scale, np.sin(angles) * scale], axis=-1)
+    return xy[:, None, :] + r[:, None, None] * unit[None, :, :]
+
+
+def draw_stars(
+    centers: Sequence[Tuple[float, float]],
+    radii: Union[float, Sequence[float]],
+    colors=None,
+    points: int = 5,
+    inner_radius_ratio: float = 0.5,
+    linewidth: float = 1.0,
+    fill: bool = True,
+    figsize: Tuple[float, float] = (8, 8),
+    save: Optional[str] = None,
+    dpi: Optional[float] = None,
+    bgcolor: str = "white",
+) -> None:
+    """
+    Draw many stars into one figure with a single PolyCollection.
+
+    Each star gets one color (edge, plus a translucent fill when `fill` is set);
+    the per-edge rainbow of draw_rainbow_star is not reproduced per shape.
+
+    Args:
+        centers, radii, colors, linewidth, figsize, save, dpi, bgcolor:
+            same semantics as draw_circles.
+        points, inner_radius_ratio: same semantics as draw_rainbow_star.
+    """
+    if points < 2 or not isinstance(points, int):
+        raise ValueError("points must be an integer >= 2")
+    if not (0.0 < inner_radius_ratio < 1.0):
+        raise ValueError("inner_radius_ratio must be between 0 and 1")
+
+    xy, r, colors = _batch_arrays(centers, radii, colors)
+    fig, ax = _batch_figure(xy, r, 0.2, figsize, bgcolor)
+
+    if len(xy):
+        pc = PolyCollection(
+            _star_vertices_batch(xy, r, inner_radius_ratio, points),
+            closed=True,
+            edgecolors=colors,
+            # translucent fill like draw_rainbow_star, opaque edges
+            facecolors=to_rgba_array(colors, alpha=0.25) if fill else "none",
+            linewidths=linewidth,
+        )
+        ax.add_collection(pc)
+
+    _finish_batch(fig, save, dpi)
+
+
+def benchmark_batch(n: int = 2000, repeat: int = 1) -> None:
+    """
+    Print per-shape cost of the batch renderers vs. the per-call functions.
+
+    Both paths render to in-memory PNGs: the per-call baseline draws each shape
+    into its own figure with draw_circle / draw_rainbow_star, the batch renderers
+    draw all `n` shapes into one figure.
+    """
+    import io
+
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(0, 100, size=(n, 2))
+    r = rng.uniform(0.2, 1.0, size=n)
+
+    def timed(fn):
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        return best
+
+    # per-call path is slow, so measure it on a small sample and scale per shape
+    sample = min(n, 50)
+
+    def per_call_circles():
+        for i in range(sample):
+            plt.close(draw_circle(r[i], center=tuple(xy[i]), save=io.BytesIO(), show=False))
+
+    def per_call_stars():
+        for i in range(sample):
+            plt.close(draw_rainbow_star(r[i], center=tuple(xy[i]), save=io.BytesIO(), show=False))
+
+    rows = [
+        ("draw_circle (per call)", timed(per_call_circles) / sample),
+        ("draw_circles (batch)", timed(lambda: draw_circles(xy, r, save=io.BytesIO())) / n),
+        ("draw_rainbow_star (per call)", timed(per_call_stars) / sample),
+        ("draw_stars (batch)", timed(lambda: draw_stars(xy, r, save=io.BytesIO())) / n),
+    ]
+    print(f"shapes: {n}")
+    for name, sec in rows:
+        print(f"{name:30s} {sec * 1e6:10.1f} us/shape")
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        # python draw.py bench [N]
+        benchmark_batch(int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
+        sys.exit(0)
+
     # 간단한 사용 예:
     # 반지름 1짜리 채워진 빨간 원을 그리고 화면에 표시하고 circle_example.png로 저장합니다.
     draw_circle(1.0, center=(0, 0), color="green", fill=True, save="circle_example.png")
@@ -0,0 +1,212 @@
+"""
+Tile-based parallel PNG export for very large draw.py canvases.
+
+draw_circle / draw_rainbow_star with a large figsize and high DPI render the
+whole raster in one process and keep it in memory until savefig finishes.
+export_tiled() instead splits the canvas into tiles, renders each tile in a
+process pool with the Agg backend and streams the rows straight into a PNG
+file, so only one band of tiles (tile height x canvas width) is held at once.
+
+Usage examples:
+  python draw_export.py circle big_circle.png --radius 1 --fill --figsize 40 40 --dpi 600
+  python draw_export.py rainbow_star big_star.png --radius 1.5 --tile 2048 --workers 8
+
+Note: the tiled canvas has the axes filling the whole figure, which replaces the
+bbox_inches="tight" cropping used by the single-shot save.
+"""
+import argparse
+import math
+import os
+import struct
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+_KINDS = ("circle", "rainbow_star")
+
+# flush compressed PNG data to disk in IDAT chunks of about this size
+_IDAT_CHUNK = 1 << 20
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+
+
+def _render_tile(kind: str, kwargs: dict, canvas: Tuple[int, int], dpi: float, box: Tuple[int, int, int, int]) -> bytes:
+    """
+    Render one tile of the canvas and return its RGB bytes (th * tw * 3).
+
+    The figure is resized to the tile and the axes are positioned so that they
+    span the full canvas, shifted so that only the tile's window is visible.
+    """
+    import numpy as np
+    import matplotlib.pyplot as plt
+    import draw
+
+    width, height = canvas
+    x0, y0, tw, th = box  # pixel box, origin at the top-left corner
+
+    fig = getattr(draw, f"draw_{kind}")(figsize=(width / dpi, height / dpi), show=False, save=None, **kwargs)
+    try:
+        fig.set_dpi(dpi)
+        fig.set_size_inches(tw / dpi, th / dpi)
+        for ax in fig.axes:
+            ax.set_position([-x0 / tw, -(height - y0 - th) / th, width / tw, height / th])
+        fig.canvas.draw()
+        rgba = np.asarray(fig.canvas.buffer_rgba())
+    finally:
+        plt.close(fig)
+
+    # Agg may round the canvas size by a pixel; crop/pad to the exact tile
+    tile = np.empty((th, tw, 3), dtype=np.uint8)
+    tile[...] = 255
+    h, w = min(th, rgba.shape[0]), min(tw, rgba.shape[1])
+    tile[:h, :w] = rgba[:h, :w, :3]
+    return tile.tobytes()
+
+
+def _png_chunk(fh, tag: bytes, data: bytes):
+    fh.write(struct.pack(">I", len(data)))
+    fh.write(tag)
+    fh.write(data)
+    fh.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag)) & 0xFFFFFFFF))
+
+
+class _PNGWriter:
+    """Minimal streaming 8-bit RGB PNG writer: rows in, IDAT chunks out."""
+
+    def __init__(self, fh, width: int, height: int, level: int = 6):
+        self.fh = fh
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._z = zlib.compressobj(level)
+        self._pending = []
+        self._pending_size = 0
+        fh.write(b"\x89PNG\r\n\x1a\n")
+        _png_chunk(fh, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def _emit(self, data: bytes):
+        if not data:
+            return
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= _IDAT_CHUNK:
+            self._flush_idat()
+
+    def _flush_idat(self):
+        if self._pending:
+            _png_chunk(self.fh, b"IDAT", b"".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+    def write_row(self, row: bytes):
+        if len(row) != self.width * 3:
+            raise ValueError(f"row must be {self.width * 3} bytes, got {len(row)}")
+        self._emit(self._z.compress(b"\x00" + row))  # filter type 0 (None)
+        self.rows_written += 1
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise ValueError(f"expected {self.height} rows, got {self.rows_written}")
+        self._emit(self._z.flush())
+        self._flush_idat()
+        _png_chunk(self.fh, b"IEND", b"")
+
+
+def export_tiled(
+    kind: str,
+    path: str,
+    figsize: Tuple[float, float] = (20, 20),
+    dpi: float = 300,
+    tile_size: int = 1024,
+    workers: Optional[int] = None,
+    **kwargs,
+) -> Tuple[int, int]:
+    """
+    Render draw_<kind>(**kwargs) at figsize/dpi into a PNG at `path`, tile by tile.
+
+    Args:
+        kind: 'circle' or 'rainbow_star'.
+        path: output PNG path.
+        figsize: canvas size in inches (same meaning as in draw.py).
+        dpi: output resolution.
+        tile_size: tile edge in pixels; peak memory is about
+            tile_size * canvas_width * 3 bytes plus one tile per worker.
+        workers: process pool size (default: os.cpu_count()).
+        **kwargs: passed to the draw function (radius, center, color, ...).
+
+    Returns:
+        (width, height) of the written image in pixels.
+    """
+    if kind not in _KINDS:
+        raise ValueError(f"kind must be one of {_KINDS}")
+    if tile_size <= 0:
+        raise ValueError("tile_size must be greater than 0")
+    for key in ("figsize", "show", "save"):
+        kwargs.pop(key, None)
+
+    width, height = int(round(figsize[0] * dpi)), int(round(figsize[1] * dpi))
+    if width <= 0 or height <= 0:
+        raise ValueError("figsize * dpi must be at least one pixel")
+
+    cols = math.ceil(width / tile_size)
+    tmp_path = path + ".part"
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool, open(tmp_path, "wb") as fh:
+            png = _PNGWriter(fh, width, height)
+            for y0 in range(0, height, tile_size):
+                th = min(tile_size, height - y0)
+                boxes = [(x0, y0, min(tile_size, width - x0), th) for x0 in range(0, width, tile_size)]
+                futures = [pool.submit(_render_tile, kind, kwargs, (width, height), dpi, box) for box in boxes]
+                tiles = [f.result() for f in futures]
+                strides = [box[2] * 3 for box in boxes]
+                for y in range(th):
+                    png.write_row(b"".join(tile[y * s:(y + 1) * s] for tile, s in zip(tiles, strides)))
+                del tiles, futures
+            png.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        # a failed tile or write must not leave a half-written .part file behind
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    print(f"Saved {path} ({width}x{height} px, {cols * math.ceil(height / tile_size)} tiles)")
+    return width, height
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a large draw.py shape as a tiled, streamed PNG.")
+    parser.add_argument("kind", choices=_KINDS, help="Shape to draw.")
+    parser.add_argument("out", help="Output PNG path.")
+    parser.add_argument("--radius", type=float, default=1.0, help="Shape radius (default: 1.0).")
+    parser.add_argument("--color", help="Circle color (circle only).")
+    parser.add_argument("--points", type=int, help="Number of star points (rainbow_star only).")
+    parser.add_argument("--fill", action="store_true", help="Fill the shape.")
+    parser.add_argument("--figsize", type=float, nargs=2, default=(20, 20), metavar=("W", "H"), help="Canvas size in inches.")
+    parser.add_argument("--dpi", type=float, default=300, help="Output resolution (default: 300).")
+    parser.add_argument("--tile", type=int, default=1024, help="Tile size in pixels (default: 1024).")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: CPU count).")
+    args = parser.parse_args(argv)
+
+    kwargs = {"radius": args.radius, "fill": args.fill}
+    if args.kind == "circle" and args.color:
+        kwargs["color"] = args.color
+    if args.kind == "rainbow_star" and args.points:
+        kwargs["points"] = args.points
+
+    try:
+        export_tiled(args.kind, args.out, figsize=tuple(args.figsize), dpi=args.dpi,
+                     tile_size=args.tile, workers=args.workers, **kwargs)
+    except ValueError as ve:
+        print(f"Error: {ve}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
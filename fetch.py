@@ -1,6 +1,576 @@
+"""
+Fetch JSON resources over HTTP.
+
+With no arguments this fetches a single sample resource and prints it. Given many
+URLs, they are fetched concurrently over one pooled requests.Session, with retry
+and exponential backoff on connection errors / 429 / 5xx responses, and an
+optional on-disk cache that revalidates with ETag / Last-Modified. In --stream
+mode large JSON arrays / NDJSON bodies are decoded incrementally and written out
+as NDJSON record by record.
+
+Usage examples:
+  python fetch.py                                   # fetch the sample todo
+  python fetch.py URL1 URL2 --workers 16
+  python fetch.py --file urls.txt --cache-dir .http_cache --out results.ndjson
+  python fetch.py BIG_URL --stream --out records.ndjson   # decode records while downloading
+  python fetch.py test                              # run self-test against a local stub server
+"""
+import argparse
+import codecs
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_URL = "https://jsonplaceholder.typicode.com/todos/1"
+
+# responses worth retrying; anything else is returned or raised immediately
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+# longest wait between attempts, whatever the backoff or a server's Retry-After says
+MAX_RETRY_DELAY = 60.0
+
+
+class ResponseCache:
+    """On-disk response cache keyed by URL, storing body plus validators (ETag / Last-Modified)."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".body"
+
+    def get(self, url):
+        """Return (meta, body) for a cached URL, or None."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as fh:
+                meta = json.load(fh)
+            with open(body_path, "rb") as fh:
+                body = fh.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return meta, body
+
+    def put(self, url, resp):
+        meta = {
+            "url": url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+        }
+        if not meta["etag"] and not meta["last_modified"]:
+            return  # nothing to revalidate with
+        meta_path, body_path = self._paths(url)
+        # write body first, then meta, each atomically, so a reader never sees a meta without its body
+        for path, data, mode in ((body_path, resp.content, "wb"), (meta_path, json.dumps(meta), "w")):
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, mode) as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+
+    @staticmethod
+    def conditional_headers(meta):
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+
+class FetchStats:
+    """Thread-safe counters for a fetch run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.finished = None
+        self.requests = 0
+        self.ok = 0
+        self.failed = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.bytes = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    def as_dict(self):
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        done = self.ok + self.failed
+        return {
+            "resources": done,
+            "ok": self.ok,
+            "failed": self.failed,
+            "requests": self.requests,
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "bytes": self.bytes,
+            "elapsed_s": round(elapsed, 3),
+            "resources_per_s": round(done / elapsed, 1) if elapsed > 0 else None,
+            "mb_per_s": round(self.bytes / elapsed / 1e6, 3) if elapsed > 0 else None,
+        }
+
+
+def make_session(pool_size=10):
+    """Return a requests.Session whose connection pool fits `pool_size` concurrent workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept"] = "application/json"
+    return session
+
+
+def _retry_delay(resp, attempt, backoff):
+    if resp is not None:
+        retry_after = resp.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_DELAY)
+    return min(backoff * (2 ** attempt), MAX_RETRY_DELAY)
+
+
+def _get(session, url, headers=None, retries=3, backoff=0.5, timeout=10, stats=None, stream=False):
+    """GET with retry on connection errors and RETRY_STATUS responses; returns the last response."""
+    attempt = 0
+    while True:
+        resp = None
+        stats.add(requests=1)
+        try:
+            resp = session.get(url, headers=headers, timeout=timeout, stream=stream)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= retries:
+                raise
+        else:
+            if resp.status_code not in RETRY_STATUS or attempt >= retries:
+                return resp
+            resp.close()
+        time.sleep(_retry_delay(resp, attempt, backoff))
+        attempt += 1
+        stats.add(retries=1)
+
+
+def fetch_bytes(session, url, cache=None, retries=3, backoff=0.5, timeout=10, stats=None):
+    """
+    GET `url` and return the response body as bytes.
+
+    Retries connection errors and RETRY_STATUS responses up to `retries` times with
+    exponential backoff (or the server's Retry-After). With a cache, a stored
+    response is revalidated and reused on 304 Not Modified.
+    """
+    stats = stats or FetchStats()
+    cached = cache.get(url) if cache else None
+    headers = ResponseCache.conditional_headers(cached[0]) if cached else {}
+
+    resp = _get(session, url, headers, retries, backoff, timeout, stats)
+    if resp.status_code == 304 and cached:
+        stats.add(cache_hits=1)
+        return cached[1]
+    resp.raise_for_status()
+    stats.add(bytes=len(resp.content))
+    if cache:
+        cache.put(url, resp)
+    return resp.content
+
+
+# a decode error this close to the buffer end may just be a truncated token ("fals", "\u00")
+_TOKEN_SLACK = 6
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+def iter_json_records(chunks, encoding="utf-8-sig"):
+    """
+    Incrementally decode JSON records from an iterable of byte chunks.
+
+    A top-level JSON array yields its elements one by one; anything else is read
+    as a sequence of JSON values (NDJSON, or a single object) and yields each
+    value. Only the not-yet-decoded tail of the input is kept in memory.
+
+    A value that is still incomplete is only decoded again once the pending
+    text has doubled, so a value spanning many chunks costs O(size) overall
+    instead of one full re-parse per chunk.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder(encoding)()
+    buf = ""
+    pos = 0
+    in_array = None  # unknown until the first non-whitespace character
+    expect = "first"  # array grammar: "first" (after "["), "value" (after ","), "sep" (after a value)
+    done = False
+    need = 0  # pending text (len(buf) - pos) required before decoding is retried
+    chunks = iter(chunks)
+    eof = False
+
+    while True:
+        if not eof:
+            try:
+                buf += text.decode(next(chunks))
+            except StopIteration:
+                buf += text.decode(b"", final=True)
+                eof = True
+        if len(buf) - pos < need and not eof:
+            continue
+        need = 0
+
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos >= len(buf):
+                break
+            if done:
+                raise ValueError(f"unexpected data after JSON array: {buf[pos:pos + 20]!r}")
+            if in_array is None:
+                in_array = buf[pos] == "["
+                if in_array:
+                    pos += 1
+                    continue
+            if in_array and expect in ("first", "sep") and buf[pos] == "]":
+                pos += 1
+                done = True
+                continue
+            if in_array and expect == "sep":
+                if buf[pos] != ",":
+                    raise ValueError(f"expected ',' or ']' in JSON array, got {buf[pos]!r}")
+                pos += 1
+                expect = "value"
+                continue
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as e:
+                # only an error at the very end of the buffer (or a string still
+                # open there) can be fixed by more data; anything else is malformed
+                if eof or (e.pos < len(buf) - _TOKEN_SLACK and not e.msg.startswith("Unterminated string")):
+                    raise
+                need = 2 * (len(buf) - pos)  # incomplete value, wait for more data
+                break
+            # a number running into the buffer end may continue in the next chunk ("1e" + "5")
+            if (not eof and isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and all(c in _NUMBER_CHARS for c in buf[end:])):
+                need = len(buf) - pos + 1
+                break
+            pos = end
+            expect = "sep"
+            yield value
+
+        if pos > 65536 and pos * 2 > len(buf):
+            buf = buf[pos:]
+            pos = 0
+        if eof:
+            if in_array and not done:
+                raise ValueError("unterminated JSON array")
+            return
+
+
+def stream_ndjson(session, url, out, chunk_size=1 << 16, retries=3, backoff=0.5, timeout=10, stats=None, lock=None):
+    """
+    Stream `url` and write its records to `out` as NDJSON as they arrive.
+
+    The body is never held in full: it is read in `chunk_size` pieces and decoded
+    with iter_json_records. Returns the number of records written.
+    """
+    stats = stats or FetchStats()
+    lock = lock or threading.Lock()
+    resp = _get(session, url, None, retries, backoff, timeout, stats, stream=True)
+    count = 0
+    with resp:
+        resp.raise_for_status()
+
+        def counted():
+            for chunk in resp.iter_content(chunk_size):
+                stats.add(bytes=len(chunk))
+                yield chunk
+
+        for record in iter_json_records(counted()):
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            with lock:
+                out.write(line)
+            count += 1
+    return count
+
+
+def fetch_many(urls, workers=8, retries=3, backoff=0.5, timeout=10, cache_dir=None, session=None):
+    """
+    Fetch and decode many JSON resources with at most `workers` requests in flight.
+
+    Returns (results, stats) where results is a list of (url, data, error) in the
+    order of `urls`; exactly one of data / error is None for each entry.
+    """
+    urls = list(urls)
+    cache = ResponseCache(cache_dir) if cache_dir else None
+    own_session = session is None
+    session = session or make_session(workers)
+    stats = FetchStats()
+
+    def work(url):
+        try:
+            data = json.loads(fetch_bytes(session, url, cache, retries, backoff, timeout, stats))
+        except (requests.RequestException, ValueError) as e:
+            stats.add(failed=1)
+            return url, None, e
+        stats.add(ok=1)
+        return url, data, None
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(work, urls))
+    finally:
+        stats.stop()
+        if own_session:
+            session.close()
+    return results, stats
+
+
+def stream_many(urls, out, workers=8, chunk_size=1 << 16, retries=3, backoff=0.5, timeout=10, session=None):
+    """
+    Stream many resources into `out` as NDJSON with at most `workers` downloads in flight.
+
+    Records from different URLs may interleave, but each line is a complete record.
+    Returns (results, stats) where results is a list of (url, record_count, error).
+    """
+    urls = list(urls)
+    own_session = session is None
+    session = session or make_session(workers)
+    stats = FetchStats()
+    lock = threading.Lock()
+
+    def work(url):
+        try:
+            count = stream_ndjson(session, url, out, chunk_size, retries, backoff, timeout, stats, lock)
+        except (requests.RequestException, ValueError) as e:
+            stats.add(failed=1)
+            return url, None, e
+        stats.add(ok=1)
+        return url, count, None
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(work, urls))
+    finally:
+        stats.stop()
+        if own_session:
+            session.close()
+    return results, stats
+
+
+def _read_url_file(path):
+    with open(path, encoding="utf-8") as fh:
+        return [line.strip() for line in fh if line.strip() and not line.lstrip().startswith("#")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch JSON resources concurrently.")
+    parser.add_argument("urls", nargs="*", help=f"URLs to fetch (default: {DEFAULT_URL}).")
+    parser.add_argument("--file", "-f", help="Read URLs from this file, one per line.")
+    parser.add_argument("--workers", "-w", type=int, default=8, help="Concurrent requests (default: 8).")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per URL (default: 3).")
+    parser.add_argument("--backoff", type=float, default=0.5, help="Initial backoff in seconds (default: 0.5).")
+    parser.add_argument("--timeout", type=float, default=10, help="Request timeout in seconds (default: 10).")
+    parser.add_argument("--cache-dir", help="Directory for the ETag/Last-Modified response cache.")
+    parser.add_argument("--out", "-o", help="Write results as NDJSON to this file instead of stdout.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Decode JSON arrays / NDJSON while downloading and write one record per line.")
+    parser.add_argument("--chunk-size", type=int, default=1 << 16, help="Read size in bytes for --stream (default: 65536).")
+    args = parser.parse_args(argv)
+
+    urls = list(args.urls)
+    if args.file:
+        urls.extend(_read_url_file(args.file))
+    if not urls:
+        urls = [DEFAULT_URL]
+
+    if args.stream:
+        out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+        try:
+            results, stats = stream_many(urls, out, workers=args.workers, chunk_size=args.chunk_size,
+                                         retries=args.retries, backoff=args.backoff, timeout=args.timeout)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        for url, _, err in results:
+            if err:
+                print(f"Error: {url}: {err}", file=sys.stderr)
+        print(json.dumps(stats.as_dict()), file=sys.stderr)
+        return 1 if stats.failed else 0
+
+    results, stats = fetch_many(urls, workers=args.workers, retries=args.retries, backoff=args.backoff,
+                                timeout=args.timeout, cache_dir=args.cache_dir)
+
+    if len(urls) == 1 and not args.out:
+        url, data, err = results[0]
+        if err:
+            print(f"Error: {url}: {err}", file=sys.stderr)
+            return 1
+        print(data)
+        return 0
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for url, data, err in results:
+            if err:
+                print(f"Error: {url}: {err}", file=sys.stderr)
+                continue
+            out.write(json.dumps({"url": url, "data": data}, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(json.dumps(stats.as_dict()), file=sys.stderr)
+    return 1 if stats.failed else 0
+
+
+def test_fetch_many():
+    # local stub server: /item/<n> returns JSON with an ETag, /flaky fails once with 503
+    import io
+    import shutil
+    import tempfile
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    hits = {"flaky": 0}
+
+    class Stub(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == "/flaky":
+                hits["flaky"] += 1
+                if hits["flaky"] == 1:
+                    self.send_response(503)
+                    self.send_header("Retry-After", "0")
+                    self.end_headers()
+                    return
+            body = json.dumps({"path": self.path}).encode()
+            etag = '"%s"' % hashlib.md5(body).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    cache_dir = tempfile.mkdtemp()
+    try:
+        urls = [f"{base}/item/{i}" for i in range(20)] + [f"{base}/flaky"]
+        results, stats = fetch_many(urls, workers=4, backoff=0, cache_dir=cache_dir)
+        assert [r[1]["path"] for r in results] == [u[len(base):] for u in urls]
+        assert stats.ok == 21 and stats.failed == 0 and stats.retries == 1
+
+        results, stats = fetch_many(urls, workers=4, backoff=0, cache_dir=cache_dir)
+        assert all(err is None for _, _, err in results)
+        assert stats.cache_hits == 21 and stats.bytes == 0
+
+        results, stats = fetch_many([f"{base}/flaky"], retries=0, cache_dir=None)
+        assert stats.ok == 1
+
+        out = io.StringIO()
+        results, stats = stream_many(urls[:5], out, workers=2, chunk_size=3)
+        assert [r[1] for r in results] == [1] * 5
+        assert sorted(json.loads(line)["path"] for line in out.getvalue().splitlines()) == [f"/item/{i}" for i in range(5)]
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def test_iter_json_records():
+    records = [{"id": i, "name": "이름", "tags": [1, 2.5, None, True]} for i in range(50)] + [12345, "s"]
+    array_body = json.dumps(records, ensure_ascii=False).encode("utf-8")
+    ndjson_body = "\n".join(json.dumps(r, ensure_ascii=False) for r in records).encode("utf-8")
+    for body in (array_body, ndjson_body, b"\xef\xbb\xbf" + array_body):
+        for size in (1, 7, len(body)):
+            chunks = [body[i:i + size] for i in range(0, len(body), size)]
+            assert list(iter_json_records(chunks)) == records
+    assert list(iter_json_records([b"[]"])) == []
+    assert list(iter_json_records([b'{"a": 1}'])) == [{"a": 1}]
+    # a value spanning many chunks is not re-parsed per chunk
+    big = json.dumps({"data": records * 200}, ensure_ascii=False).encode("utf-8")
+    calls = []
+    real_decoder = json.JSONDecoder
+
+    class CountingDecoder(real_decoder):
+        def raw_decode(self, s, idx=0):
+            calls.append(idx)
+            return super().raw_decode(s, idx)
+
+    json.JSONDecoder = CountingDecoder
+    try:
+        chunks = [big[i:i + 1024] for i in range(0, len(big), 1024)]
+        assert list(iter_json_records(chunks)) == [{"data": records * 200}]
+    finally:
+        json.JSONDecoder = real_decoder
+    assert len(calls) < 40, len(calls)  # ~log2(chunks) retries, not one per chunk
+    # a malformed record fails fast instead of buffering the rest of the body
+    consumed = []
+
+    def body_chunks():
+        yield b'[{"a": 1}, {"b": tru}, '
+        for i in range(2000):
+            consumed.append(i)
+            yield b'{"c": 1}, ' * 100
+        yield b"{}]"
+
+    try:
+        list(iter_json_records(body_chunks()))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("accepted a malformed record")
+    assert len(consumed) <= 1, len(consumed)
+    # tokens cut at a chunk boundary are still decoded
+    for body, expected in ((b'[1e5, "\\u00e9", false, -12.5, "x"]', [1e5, "\u00e9", False, -12.5, "x"]),
+                           (b'{"k": "\\u00e9\\n", "v": [true, null, 1E-3]}\n', [{"k": "\u00e9\n", "v": [True, None, 1e-3]}])):
+        for cut in range(1, len(body)):
+            assert list(iter_json_records([body[:cut], body[cut:]])) == expected, cut
+    for bad in (b"[1, 2", b"[1, }", b"[1 2 3]", b"[,,1,]", b"[1,]", b"[1]garbage", b"[1] [2]", b"[,]"):
+        try:
+            list(iter_json_records([bad]))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"accepted {bad!r}")
+
+
+def test_retry_delay():
+    class Resp:
+        def __init__(self, retry_after):
+            self.headers = {"Retry-After": retry_after}
+
+    assert _retry_delay(Resp("2"), 0, 0.5) == 2.0
+    assert _retry_delay(Resp("3600"), 0, 0.5) == MAX_RETRY_DELAY
+    assert _retry_delay(Resp(""), 3, 0.5) == 4.0
+    assert _retry_delay(None, 20, 0.5) == MAX_RETRY_DELAY
+
+
+def run_tests():
+    test_retry_delay()
+    test_iter_json_records()
+    test_fetch_many()
+    print("모든 테스트 통과")
+
 
-url = "https://jsonplaceholder.typicode.com/todos/1"
-resp = requests.get(url, timeout=10)
-resp.raise_for_status()
-print(resp.json())
\ No newline at end of file
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        run_tests()
+    else:
+        sys.exit(main())
@@ -6,25 +6,125 @@ def greet(name):
         name = "Guest"
     return f"Hello, {name}!"
 
+import io
+import os
 import sys
+import time
+from itertools import islice
+
+# 배치 모드에서 한 번에 읽고 쓰는 줄 수 (프로세스 풀 작업 단위이기도 함)
+BATCH_LINES = 10000
+WRITE_BUFFER = 1 << 20
 
 def main():
     # 표준입출력으로 사용자 이름 입력받아 인사 출력
     name = input("이름을 입력하세요: ").strip()
     print(greet(name))
 
+def greet_chunk(lines):
+    # 줄 목록을 인사말 문자열 하나로 변환 (한 줄에 한 명, main처럼 앞뒤 공백 제거)
+    return "".join([greet(line.strip()) + "\n" for line in lines])
+
+def _chunks(infile, size):
+    while True:
+        lines = list(islice(infile, size))
+        if not lines:
+            return
+        yield lines
+
+def run_batch(infile, outfile, workers=1, chunk_lines=BATCH_LINES):
+    # infile의 각 줄을 인사말로 바꿔 outfile에 쓰고, 처리한 줄 수를 반환
+    # workers > 1이면 청크를 프로세스 풀에서 변환 (출력 순서는 입력 순서와 같음)
+    count = 0
+    chunks = _chunks(infile, chunk_lines)
+    if workers > 1:
+        from multiprocessing import Pool
+        with Pool(workers) as pool:
+            for text in pool.imap(greet_chunk, chunks):
+                outfile.write(text)
+                count += text.count("\n")
+    else:
+        for lines in chunks:
+            outfile.write(greet_chunk(lines))
+            count += len(lines)
+    outfile.flush()
+    return count
+
+def batch_main(path=None, out=None, workers=1):
+    # path/out이 없거나 "-"이면 표준입출력 사용
+    infile = sys.stdin if path in (None, "-") else open(path, encoding="utf-8", newline=None)
+    outfile = (io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", write_through=False, line_buffering=False)
+               if out in (None, "-") else open(out, "w", encoding="utf-8", buffering=WRITE_BUFFER))
+    try:
+        return run_batch(infile, outfile, workers=workers)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if out in (None, "-"):
+            outfile.detach()
+        else:
+            outfile.close()
+
+def bench(n=200000, workers=(1, 4)):
+    # 기존 input()/print() 경로와 배치 경로의 처리량(줄/초) 비교
+    names = "".join(f"name{i}\n" for i in range(n))
+    rows = []
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        stdin, stdout = sys.stdin, sys.stdout
+        sys.stdin, sys.stdout = io.StringIO(names), devnull
+        try:
+            t0 = time.perf_counter()
+            for _ in range(n):
+                main()
+            rows.append(("input()/print() per call", time.perf_counter() - t0))
+        finally:
+            sys.stdin, sys.stdout = stdin, stdout
+    for w in workers:
+        with open(os.devnull, "w", encoding="utf-8", buffering=WRITE_BUFFER) as devnull:
+            t0 = time.perf_counter()
+            run_batch(io.StringIO(names), devnull, workers=w)
+            rows.append((f"run_batch (workers={w})", time.perf_counter() - t0))
+    print(f"names: {n}")
+    for label, sec in rows:
+        print(f"{label:28s} {n / sec:14,.0f} lines/s")
+
 def test_greet():
     # 간단한 테스트 함수 (성공하면 예외 발생 없음)
     assert greet("Alice") == "Hello, Alice!"
     assert greet("") == "Hello, Guest!"
     assert greet(None) == "Hello, Guest!"
 
+def test_run_batch():
+    names = ["Alice", "", "  Bob  ", "Carol"] * 3
+    expected = "".join(greet(n.strip()) + "\n" for n in names)
+    for workers in (1, 2):
+        out = io.StringIO()
+        assert run_batch(io.StringIO("\n".join(names) + "\n"), out, workers=workers, chunk_lines=5) == len(names)
+        assert out.getvalue() == expected
+
 def run_tests():
     test_greet()
+    test_run_batch()
     print("모든 테스트 통과")
 
+def cli(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="이름을 입력받아 인사합니다. --batch로 여러 줄을 한 번에 처리합니다.")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="FILE(생략 또는 -이면 표준입력)의 한 줄당 한 명씩 인사말을 출력합니다.")
+    parser.add_argument("--out", "-o", default="-", help="배치 출력 파일 (기본: 표준출력)")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="배치 변환 프로세스 수 (기본: 1)")
+    parser.add_argument("--bench", type=int, metavar="N", help="N개의 이름으로 처리량을 비교합니다.")
+    args = parser.parse_args(argv)
+    if args.bench:
+        bench(args.bench)
+    elif args.batch:
+        batch_main(args.batch, args.out, workers=args.workers)
+    else:
+        main()
+
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "test":
         run_tests()
     else:
-        main()
+        cli(sys.argv[1:])
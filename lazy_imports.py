@@ -0,0 +1,56 @@
+"""
+Deferred imports for the sales CLIs.
+
+matplotlib / pandas take hundreds of milliseconds to import, which dominates
+short runs such as --help or a CSV that fails validation. lazy_import() returns
+a stand-in that imports the real module on first attribute access, so the cost
+is only paid on code paths that actually plot or build DataFrames.
+
+Usage:
+  plt = lazy_import("matplotlib.pyplot")
+  plt.figure()          # matplotlib is imported here
+"""
+import importlib
+import importlib.util
+
+
+class LazyModule:
+    """Proxy for a module that is imported on first attribute access."""
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_name"])
+            self.__dict__["_module"] = module
+        return module
+
+    @property
+    def loaded(self):
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self.__dict__['_name']!r} ({state})>"
+
+
+def lazy_import(name):
+    """Return a LazyModule for `name` (e.g. "matplotlib.pyplot")."""
+    return LazyModule(name)
+
+
+def is_available(name):
+    """True if the top-level package of `name` is installed, without importing it."""
+    try:
+        return importlib.util.find_spec(name.partition(".")[0]) is not None
+    except (ImportError, ValueError):
+        return False
@@ -11,13 +11,21 @@ Usage examples:
   python sales.py --file sales.csv          # read sales.csv and show plot
   python sales.py --file sales.csv --out monthly.png   # save plot to monthly.png
   python sales.py --sample --out demo.png  # use generated sample data and save plot
+  python sales.py --file "exports/*.csv.gz" --out monthly.png   # merge compressed shards
 """
 import sys
 import argparse
 import csv
 from collections import defaultdict, OrderedDict
 from datetime import datetime
-import matplotlib.pyplot as plt
+
+import csv_scan
+import sales_io
+from lazy_imports import lazy_import
+from sales_records import SalesRecords
+
+# imported on first use so --help and failing runs don't pay for matplotlib
+plt = lazy_import("matplotlib.pyplot")
 
 DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%Y%m%d")
 
@@ -36,17 +44,70 @@ def parse_date(s):
         raise ValueError(f"unrecognized date format: {s}")
 
 
-def read_sales_csv(path):
-    """Read CSV file and return list of (date, amount). Raises exceptions on errors."""
-    rows = []
+def _read_one_csv(path):
+    try:
+        return _read_records(path)
+    except ValueError as e:
+        # name the shard: with a glob or directory the line number alone is ambiguous
+        raise ValueError(f"{path}: {e}") from e
+
+
+def _read_records(path):
+    if not sales_io.is_compressed(path) and not csv_scan.needs_csv_module(path):
+        rows = _scan_records(path)
+        if rows is not None:
+            return rows
+    return _read_records_csv(path)
+
+
+def _scan_records(path):
+    """
+    Fast path for plain, unquoted files through the mmap scanner (csv_scan).
+
+    Returns None as soon as a row is blank or invalid; the caller then re-reads
+    the file with _read_records_csv, which skips blank lines and raises the
+    usual line-numbered error, so both paths behave the same.
+    """
+    header = csv_scan.read_first_row(path)
+    if not header or "date" not in header or "amount" not in header:
+        return None
+    # DictReader keeps the last of duplicate column names
+    date_idx = len(header) - 1 - header[::-1].index("date")
+    amt_idx = len(header) - 1 - header[::-1].index("amount")
+    rows = SalesRecords()
+    ordinals = {}
+    for raw_dates, raw_amounts in csv_scan.scan_columns(path, [date_idx, amt_idx], skip_first=True):
+        days, amounts = [], []
+        for raw_date, raw_amount in zip(raw_dates, raw_amounts):
+            raw_date, raw_amount = raw_date.strip(), raw_amount.strip()
+            if not raw_date or not raw_amount:
+                return None
+            ordinal = ordinals.get(raw_date)
+            if ordinal is None:
+                try:
+                    ordinal = ordinals[raw_date] = parse_date(raw_date).toordinal()
+                except ValueError:
+                    return None
+            try:
+                amounts.append(float(raw_amount))
+            except ValueError:
+                return None
+            days.append(ordinal)
+        rows.extend_arrays(days, amounts)
+    return rows
+
+
+def _read_records_csv(path):
+    rows = SalesRecords()
     try:
-        with open(path, newline="", encoding="utf-8") as fh:
+        with sales_io.open_text(path) as fh:
             reader = csv.DictReader(fh)
-            if "date" not in reader.fieldnames or "amount" not in reader.fieldnames:
+            if not reader.fieldnames or "date" not in reader.fieldnames or "amount" not in reader.fieldnames:
                 raise ValueError("CSV must contain 'date' and 'amount' columns")
             for i, row in enumerate(reader, start=2):  # header is line 1
-                raw_date = row.get("date", "").strip()
-                raw_amount = row.get("amount", "").strip()
+                # short rows give None for the missing columns
+                raw_date = (row.get("date") or "").strip()
+                raw_amount = (row.get("amount") or "").strip()
                 if not raw_date or not raw_amount:
                     raise ValueError(f"missing data on line {i}")
                 try:
@@ -57,28 +118,43 @@ def read_sales_csv(path):
                     amt = float(raw_amount)
                 except ValueError:
                     raise ValueError(f"line {i}: invalid amount: {raw_amount}")
-                rows.append((d, amt))
+                rows.append(d, amt)
     except FileNotFoundError:
         raise
     return rows
 
 
+def read_sales_csv(path, workers=None):
+    """
+    Read CSV file(s) and return SalesRecords of (date, amount). Raises exceptions on errors.
+
+    `path` may be a single CSV, a glob or a directory; shards may be compressed
+    (.gz/.bz2/.xz/.zst) and are read in parallel, concatenated in sorted path order.
+    """
+    paths = sales_io.expand_inputs(path)
+    if not paths:
+        raise FileNotFoundError(path)
+    if len(paths) == 1:
+        return _read_one_csv(paths[0])
+    return sales_io.concat_records(sales_io.map_shards(_read_one_csv, paths, workers))
+
+
 def generate_sample_data():
-    """Return sample list of (date, amount) for a few months."""
-    sample = []
+    """Return sample SalesRecords of (date, amount) for a few months."""
+    sample = SalesRecords()
     base = datetime(2025, 1, 1).date()
     import random
 
     for month in range(1, 7):  # Jan..Jun
         for day in (5, 10, 15, 20):
-            sample.append(
-                (datetime(2025, month, day).date(), round(random.uniform(50, 500), 2))
-            )
+            sample.append(datetime(2025, month, day).date(), round(random.uniform(50, 500), 2))
     return sample
 
 
 def aggregate_by_month(rows):
-    """Aggregate list of (date, amount) into OrderedDict[YYYY-MM] = sum"""
+    """Aggregate SalesRecords (or any iterable of (date, amount)) into OrderedDict[YYYY-MM] = sum"""
+    if isinstance(rows, SalesRecords):
+        return rows.month_sums()
     sums = defaultdict(float)
     for d, amt in rows:
         key = f"{d.year:04d}-{d.month:02d}"
@@ -89,6 +165,8 @@ def aggregate_by_month(rows):
 
 
 def plot_monthly_sums(month_sums, title="Monthly Sales", out_path=None):
+    if isinstance(month_sums, SalesRecords):
+        month_sums = aggregate_by_month(month_sums)
     if not month_sums:
         raise ValueError("no data to plot")
     months = list(month_sums.keys())
@@ -122,7 +200,11 @@ def plot_monthly_sums(month_sums, title="Monthly Sales", out_path=None):
 def main(argv=None):
     parser = argparse.ArgumentParser(description="Plot monthly sales sums from a CSV file.")
     parser.add_argument(
-        "--file", "-f", help="Path to CSV file with 'date' and 'amount' columns."
+        "--file", "-f",
+        help="Path, glob or directory of CSV files with 'date' and 'amount' columns (.gz/.bz2/.xz/.zst ok).",
+    )
+    parser.add_argument(
+        "--workers", "-w", type=int, help="Processes used to read multiple files (default: CPU count)."
     )
     parser.add_argument(
         "--out", "-o", help="If given, save plot to this image file instead of showing."
@@ -138,7 +220,7 @@ def main(argv=None):
         if args.sample:
             rows = generate_sample_data()
         elif args.file:
-            rows = read_sales_csv(args.file)
+            rows = read_sales_csv(args.file, workers=args.workers)
         else:
             # no file and not sample: suggest usage and exit
             print(
@@ -0,0 +1,433 @@
+"""
+Rolling-window analytics over monthly sales series.
+
+Computes 3/6/12-month moving averages, month-over-month and year-over-year
+growth for the monthly totals of analyze_sales.read_sales() or a Year/Month
+table: a CSV such as awx-lab/py/dw_sales.csv, or the Parquet dataset
+awx-lab/py/dw_sales.parquet/ that query_dw.py now writes (needs pyarrow).
+Months missing from the series count as 0.
+
+Two paths share the same definitions:
+  - rolling_table(): batch/backfill over a whole series, with prefix sums
+    (NumPy cumsum when it is installed)
+  - RollingMonthly: incremental state. Only the last 13 months (or the longest
+    window) are kept in a ring buffer with one running sum per window, so adding a month
+    (or updating the latest, still growing month) is O(1). The state is
+    saved as a small JSON file.
+
+Usage:
+  python sales_analytics.py --file sales.csv
+  python sales_analytics.py --file awx-lab/py/dw_sales.parquet --state dw.rolling.json
+  python sales_analytics.py --state dw.rolling.json --add 2014-02 51234.5
+  python sales_analytics.py test
+"""
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import sys
+from collections import OrderedDict, deque
+
+import csv_scan
+import sales_io
+from lazy_imports import lazy_import, is_available
+
+np = lazy_import("numpy") if is_available("numpy") else None
+
+WINDOWS = (3, 6, 12)
+STATE_VERSION = 1
+
+
+def month_index(ym):
+    """'YYYY-MM' or (year, month) -> months since year 0."""
+    if isinstance(ym, str):
+        year, month = int(ym[:4]), int(ym[5:7])
+    else:
+        year, month = ym
+    if not 1 <= month <= 12:
+        raise ValueError(f"bad month: {ym!r}")
+    return year * 12 + month - 1
+
+
+def month_label(index):
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def _growth(current, previous):
+    if previous is None or previous == 0:
+        return None
+    return current / previous - 1.0
+
+
+def fill_months(monthly):
+    """Return (first month index, amounts) with missing months between first and last set to 0."""
+    items = sorted((month_index(k), v) for k, v in monthly.items())
+    if not items:
+        return None, []
+    first = items[0][0]
+    values = [0.0] * (items[-1][0] - first + 1)
+    for index, amount in items:
+        values[index - first] += amount
+    return first, values
+
+
+def _prefix_sums(values):
+    if np is not None:
+        p = np.zeros(len(values) + 1)
+        np.cumsum(np.asarray(values, dtype=float), out=p[1:])
+        return p.tolist()
+    return list(itertools.accumulate(values, initial=0.0))
+
+
+def rolling_table(monthly, windows=WINDOWS):
+    """
+    Batch path: one row per month (gaps filled) of the monthly series.
+
+    Args:
+        monthly: mapping YYYY-MM -> amount (e.g. read_sales() output).
+        windows: moving-average window lengths in months.
+
+    Returns a list of dicts with keys ym, amount, ma<w> for each window,
+    mom and yoy; a value is None while there is not enough history
+    (or the base month is 0 for growth).
+    """
+    first, values = fill_months(monthly)
+    if first is None:
+        return []
+    p = _prefix_sums(values)
+    rows = []
+    for i, amount in enumerate(values):
+        row = {"ym": month_label(first + i), "amount": amount}
+        for w in windows:
+            row[f"ma{w}"] = (p[i + 1] - p[i + 1 - w]) / w if i + 1 >= w else None
+        row["mom"] = _growth(amount, values[i - 1] if i >= 1 else None)
+        row["yoy"] = _growth(amount, values[i - 12] if i >= 12 else None)
+        rows.append(row)
+    return rows
+
+
+class RollingMonthly:
+    """Incrementally maintained moving averages and MoM/YoY growth of a monthly series."""
+
+    def __init__(self, windows=WINDOWS):
+        self.windows = tuple(sorted(set(int(w) for w in windows)))
+        if not self.windows or self.windows[0] < 1:
+            raise ValueError("windows must be positive month counts")
+        # YoY needs the month 12 months back, so keep at least 13 months
+        self.ring = deque(maxlen=max(self.windows[-1], 13))
+        self.sums = dict.fromkeys(self.windows, 0.0)
+        self.last = None   # month index of ring[-1]
+        self.count = 0     # months seen, including filled gaps
+
+    @classmethod
+    def from_series(cls, monthly, windows=WINDOWS):
+        """Backfill: build the state from a whole series without stepping through every month."""
+        state = cls(windows)
+        first, values = fill_months(monthly)
+        if first is not None:
+            state._restore(first + len(values) - 1, len(values), values[-state.ring.maxlen:])
+        return state
+
+    def _restore(self, last, count, ring):
+        self.ring.clear()
+        self.ring.extend(ring)
+        self.last = last
+        self.count = count
+        tail = list(self.ring)
+        self.sums = {w: math.fsum(tail[-w:]) for w in self.windows}
+
+    def _advance(self, amount):
+        ring = self.ring
+        for w in self.windows:
+            leaving = ring[-w] if len(ring) >= w else 0.0
+            self.sums[w] += amount - leaving
+        ring.append(amount)
+        self.count += 1
+
+    def push(self, ym, amount):
+        """
+        Add the total of month `ym` ('YYYY-MM' or (year, month)) and return its row.
+
+        Pushing the latest month again replaces its total (a month still in
+        progress); months skipped since the last push count as 0. Months
+        older than the latest one raise ValueError, since their effect on the
+        windows is gone; rebuild with from_series() instead.
+        """
+        index = month_index(ym)
+        amount = float(amount)
+        if self.last is not None and index < self.last:
+            raise ValueError(f"{month_label(index)} is older than the latest month {month_label(self.last)}")
+        if self.last is not None and index == self.last:
+            delta = amount - self.ring[-1]
+            self.ring[-1] = amount
+            for w in self.windows:
+                self.sums[w] += delta
+            return self.row()
+        gap = 0 if self.last is None else index - self.last - 1
+        if gap >= self.ring.maxlen:
+            # the whole ring would be zeros
+            self._restore(index - 1, self.count + gap, [0.0] * self.ring.maxlen)
+        else:
+            for _ in range(gap):
+                self._advance(0.0)
+        self._advance(amount)
+        self.last = index
+        return self.row()
+
+    def row(self):
+        """Row (as in rolling_table()) for the latest month, or None before the first push."""
+        if self.last is None:
+            return None
+        ring, n = self.ring, self.count
+        amount = ring[-1]
+        row = {"ym": month_label(self.last), "amount": amount}
+        for w in self.windows:
+            row[f"ma{w}"] = self.sums[w] / w if n >= w else None
+        row["mom"] = _growth(amount, ring[-2] if n >= 2 else None)
+        row["yoy"] = _growth(amount, ring[-13] if n >= 13 else None)
+        return row
+
+    def to_dict(self):
+        return {
+            "version": STATE_VERSION,
+            "windows": list(self.windows),
+            "last": None if self.last is None else month_label(self.last),
+            "count": self.count,
+            "ring": list(self.ring),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != STATE_VERSION:
+            raise ValueError("unsupported rolling state version")
+        state = cls(data["windows"])
+        if data.get("last"):
+            state._restore(month_index(data["last"]), int(data["count"]), [float(v) for v in data["ring"]])
+        return state
+
+    def save(self, path):
+        """Write the state to `path` atomically."""
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
+
+
+def read_month_table(path):
+    """
+    Read a Year/Month/amount table (awx-lab dw_sales.csv, oltp_sales.csv).
+
+    Returns OrderedDict[YYYY-MM] = amount, or None if the file has no Year and
+    Month columns (then it is a date/amount file for read_sales()).
+    """
+    with sales_io.open_text(path, encoding="utf-8-sig") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if header is None:
+            return None
+        found = csv_scan.detect_month_columns(header)
+        if found is None:
+            return None
+        y, m, a = found
+        monthly = {}
+        for row in reader:
+            try:
+                key = f"{int(row[y]):04d}-{int(row[m]):02d}"
+                amount = float(row[a].replace(",", "")) if a < len(row) and row[a].strip() else 0.0
+            except (ValueError, IndexError):
+                continue
+            monthly[key] = monthly.get(key, 0.0) + amount
+    return OrderedDict(sorted(monthly.items()))
+
+
+def read_monthly_series(path, workers=None):
+    """
+    Monthly totals of `path`: a Year/Month Parquet dataset or CSV table, or any
+    input analyze_sales.read_sales() accepts.
+    """
+    if sales_io.is_dataset(path):
+        return sales_io.read_dataset_month_sums(path)
+    paths = sales_io.expand_inputs(path)
+    if len(paths) == 1 and os.path.isfile(paths[0]):
+        monthly = read_month_table(paths[0])
+        if monthly is not None:
+            return monthly
+    from analyze_sales import read_sales
+
+    return read_sales(path, workers=workers)
+
+
+def _fmt(value, pct=False):
+    if value is None:
+        return "-"
+    return f"{value * 100:+.1f}%" if pct else f"{value:.2f}"
+
+
+def print_rows(rows, windows=WINDOWS):
+    if not rows:
+        print("데이터가 없습니다.")
+        return
+    cols = ["amount"] + [f"ma{w}" for w in windows]
+    print(f"{'YM':8s} " + " ".join(f"{c:>14s}" for c in cols) + f" {'MoM':>9s} {'YoY':>9s}")
+    for row in rows:
+        cells = " ".join(f"{_fmt(row[c]):>14s}" for c in cols)
+        print(f"{row['ym']:8s} {cells} {_fmt(row['mom'], True):>9s} {_fmt(row['yoy'], True):>9s}")
+
+
+def update_state(state, monthly):
+    """Push the months of `monthly` from the state's latest month on; return the new rows."""
+    rows = []
+    for key, amount in monthly.items():
+        if state.last is None or month_index(key) >= state.last:
+            rows.append(state.push(key, amount))
+    return rows
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="월별 매출의 이동평균(3/6/12개월)과 전월/전년 대비 증감률을 계산합니다.")
+    p.add_argument("--file", "-f", help="매출 CSV (date/amount 파일, glob, 디렉터리 또는 Year/Month 표)")
+    p.add_argument("--workers", "-w", type=int, help="여러 파일을 읽을 프로세스 수 (기본: CPU 수)")
+    p.add_argument("--state", help="증분 상태 JSON 경로. 있으면 마지막 월 이후만 반영하고 다시 저장합니다.")
+    p.add_argument("--add", nargs=2, metavar=("YYYY-MM", "AMOUNT"), help="--state에 한 달 합계를 추가(같은 달이면 교체)합니다.")
+    p.add_argument("--windows", type=int, nargs="+", default=list(WINDOWS), help="이동평균 기간(개월, 기본: 3 6 12)")
+    p.add_argument("--last", type=int, metavar="N", help="마지막 N개월만 출력합니다.")
+    args = p.parse_args(argv)
+
+    if not args.file and not args.add:
+        p.error("--file 또는 --add가 필요합니다.")
+    if args.add and not args.state:
+        p.error("--add에는 --state가 필요합니다.")
+
+    try:
+        monthly = read_monthly_series(args.file, workers=args.workers) if args.file else None
+        if not args.state:
+            rows = rolling_table(monthly, args.windows)
+        else:
+            state = None
+            if os.path.exists(args.state):
+                state = RollingMonthly.load(args.state)
+                if list(state.windows) != sorted(set(args.windows)):
+                    state = None  # windows changed: rebuild
+            if state is None and monthly is not None:
+                # backfill: batch table for output, state from the tail of the series
+                rows = rolling_table(monthly, args.windows)
+                state = RollingMonthly.from_series(monthly, args.windows)
+            else:
+                state = state or RollingMonthly(args.windows)
+                rows = update_state(state, monthly) if monthly is not None else []
+            if args.add:
+                rows.append(state.push(args.add[0], args.add[1]))
+            state.save(args.state)
+    except FileNotFoundError:
+        print(f"파일을 찾을 수 없습니다: {args.file}", file=sys.stderr)
+        return 2
+    except (ValueError, ImportError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    print_rows(rows[-args.last:] if args.last else rows, state.windows if args.state else args.windows)
+    return 0
+
+
+def test_incremental_matches_batch():
+    import random
+
+    rng = random.Random(7)
+    monthly = OrderedDict()
+    index = month_index("2019-01")
+    for _ in range(60):
+        index += rng.choice((1, 1, 1, 2, 3))  # some missing months
+        monthly[month_label(index)] = round(rng.uniform(0, 1000), 2)
+    monthly[month_label(index + 20)] = 5.0  # gap longer than the ring
+
+    batch = rolling_table(monthly)
+    state = RollingMonthly()
+    by_month = {row["ym"]: row for row in batch}
+    for key, amount in monthly.items():
+        row = state.push(key, amount)
+        expected = by_month[key]
+        for k, v in expected.items():
+            if isinstance(v, float) and row[k] is not None:
+                assert math.isclose(row[k], v, rel_tol=1e-9, abs_tol=1e-6), (key, k, row[k], v)
+            else:
+                assert row[k] == v, (key, k, row[k], v)
+
+    backfilled = RollingMonthly.from_series(monthly)
+    assert backfilled.count == state.count and backfilled.last == state.last
+    assert list(backfilled.ring) == list(state.ring)
+    assert all(math.isclose(backfilled.sums[w], state.sums[w], abs_tol=1e-6) for w in WINDOWS)
+
+    # re-pushing the latest month replaces it
+    before = state.row()
+    state.push(month_label(state.last), before["amount"] + 30)
+    assert math.isclose(state.row()["ma3"], before["ma3"] + 10)
+    try:
+        state.push("2019-01", 1.0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("older month accepted")
+
+
+def test_state_roundtrip():
+    import tempfile
+
+    monthly = OrderedDict((month_label(month_index("2020-01") + i), float(i + 1)) for i in range(30))
+    head = OrderedDict(list(monthly.items())[:20])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "state.json")
+        RollingMonthly.from_series(head).save(path)
+        state = RollingMonthly.load(path)
+        rows = update_state(state, monthly)
+    assert [r["ym"] for r in rows] == list(monthly)[19:]
+    expected = rolling_table(monthly)[-1]
+    assert rows[-1] == expected, (rows[-1], expected)
+
+
+def test_month_tables():
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dw_sales.csv")
+        with open(path, "w", encoding="utf-8", newline="") as fh:
+            fh.write("\ufeffYear,Month,TotalSales\n2021,2,5\n2021,1,2.5\n2021,2,1\n")
+        assert read_monthly_series(path) == OrderedDict([("2021-01", 2.5), ("2021-02", 6.0)])
+
+        if not is_available("pyarrow"):
+            print("pyarrow 없음: Parquet 데이터셋 테스트 생략")
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # sales_store layout: dw_sales.parquet/_CURRENT -> v2/Year=2021/...; v1 is stale
+        root = os.path.join(tmp, "dw_sales.parquet")
+        for version, amount in (("v1", 100.0), ("v2", 3.0)):
+            os.makedirs(os.path.join(root, version))
+            table = pa.table({"Year": [2021, 2021, 2022], "Month": [1, 1, 12], "TotalSales": [amount, 1.0, 4.0]})
+            pq.write_to_dataset(table, os.path.join(root, version), partition_cols=["Year"])
+        with open(os.path.join(root, sales_io.DATASET_POINTER), "w", encoding="utf-8") as fh:
+            fh.write("v2\n")
+        expected = OrderedDict([("2021-01", 4.0), ("2022-12", 4.0)])
+        assert read_monthly_series(root) == expected, read_monthly_series(root)
+        assert rolling_table(read_monthly_series(root))[-1]["ym"] == "2022-12"
+
+
+def run_tests():
+    test_incremental_matches_batch()
+    test_state_roundtrip()
+    test_month_tables()
+    print("모든 테스트 통과")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        run_tests()
+    else:
+        sys.exit(main())
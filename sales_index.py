@@ -0,0 +1,275 @@
+"""
+Prefix-sum daily index for date-range and rollup queries over sales data.
+
+The index stores the sorted distinct sale days (int32 day ordinals) and the
+cumulative amount up to each day (float64, one extra leading 0.0), so the
+total for any [start, end) range is two binary searches and a subtraction:
+
+    total(start, end) = cumsum[bisect(days, end)] - cumsum[bisect(days, start)]
+
+Rollups to week / month / quarter / (fiscal) year or custom buckets are one
+such range query per bucket. The index can be saved to and loaded from a small
+binary file, so the CSV only has to be parsed once.
+
+Usage:
+  index = DailyIndex.from_records(read_sales_records("sales.csv"))
+  index.total(date(2025, 1, 1), date(2025, 4, 1))
+  index.rollup("quarter")
+  index.rollup("fy", fy_start_month=4)
+  index.rollup(edges=[date(2025, 1, 1), date(2025, 2, 15), date(2025, 6, 1)])
+  index.save("sales.idx"); DailyIndex.load("sales.idx")
+
+  python sales_index.py test   # checks against brute-force sums
+"""
+import json
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from sales_records import DAY_TYPECODE, AMOUNT_TYPECODE
+
+GRAINS = ("day", "week", "month", "quarter", "year", "fy")
+
+_MAGIC = b"SIDX1\0"
+_HEADER = struct.Struct("<6sQI")  # magic, day count, metadata length
+
+
+def _ordinal(d):
+    return d if isinstance(d, int) else d.toordinal()
+
+
+def _add_months(d, months):
+    m = d.month - 1 + months
+    return date(d.year + m // 12, m % 12 + 1, 1)
+
+
+def _bucket_start(d, grain, fy_start_month):
+    if grain == "day":
+        return d
+    if grain == "week":
+        return d - timedelta(days=d.weekday())
+    if grain == "month":
+        return d.replace(day=1)
+    if grain == "quarter":
+        return date(d.year, (d.month - 1) // 3 * 3 + 1, 1)
+    if grain == "year":
+        return date(d.year, 1, 1)
+    # fiscal year starting on the first of fy_start_month
+    year = d.year if d.month >= fy_start_month else d.year - 1
+    return date(year, fy_start_month, 1)
+
+
+def _next_bucket(start, grain):
+    if grain == "day":
+        return start + timedelta(days=1)
+    if grain == "week":
+        return start + timedelta(days=7)
+    if grain == "month":
+        return _add_months(start, 1)
+    if grain == "quarter":
+        return _add_months(start, 3)
+    return _add_months(start, 12)  # year / fy
+
+
+def _bucket_label(start, grain, fy_start_month):
+    if grain == "day":
+        return start.isoformat()
+    if grain == "week":
+        iso_year, week, _ = start.isocalendar()
+        return f"{iso_year:04d}-W{week:02d}"
+    if grain == "month":
+        return f"{start.year:04d}-{start.month:02d}"
+    if grain == "quarter":
+        return f"{start.year:04d}-Q{(start.month - 1) // 3 + 1}"
+    if grain == "year":
+        return f"{start.year:04d}"
+    # fiscal years are named after the calendar year they end in
+    return f"FY{start.year + (1 if fy_start_month > 1 else 0):04d}"
+
+
+class DailyIndex:
+    """Sorted day ordinals + cumulative amounts supporting O(log n) range totals."""
+
+    __slots__ = ("days", "cumsum", "meta")
+
+    def __init__(self, days, cumsum, meta=None):
+        if len(cumsum) != len(days) + 1:
+            raise ValueError("cumsum must have exactly one more entry than days")
+        self.days = days
+        self.cumsum = cumsum
+        self.meta = meta or {}
+
+    @classmethod
+    def from_records(cls, records, meta=None):
+        """Build from SalesRecords (amounts of the same day are summed)."""
+        days = array(DAY_TYPECODE)
+        cumsum = array(AMOUNT_TYPECODE, [0.0])
+        running = 0.0
+        for d, amount in sorted(records.day_sums().items()):
+            running += amount
+            days.append(d)
+            cumsum.append(running)
+        return cls(days, cumsum, meta)
+
+    def __len__(self):
+        return len(self.days)
+
+    @property
+    def first_day(self):
+        return date.fromordinal(self.days[0]) if self.days else None
+
+    @property
+    def last_day(self):
+        return date.fromordinal(self.days[-1]) if self.days else None
+
+    def total(self, start=None, end=None):
+        """Sum of amounts for days in [start, end); None means unbounded."""
+        lo = 0 if start is None else bisect_left(self.days, _ordinal(start))
+        hi = len(self.days) if end is None else bisect_left(self.days, _ordinal(end))
+        if hi <= lo:
+            return 0.0
+        return self.cumsum[hi] - self.cumsum[lo]
+
+    def rollup(self, grain="month", fy_start_month=1, edges=None):
+        """
+        Return OrderedDict[label] = total per bucket, from the first to the last sale day.
+
+        Args:
+            grain: one of GRAINS ("fy" = fiscal year starting on fy_start_month).
+            fy_start_month: first month of the fiscal year (1-12).
+            edges: custom bucket boundaries (dates); buckets are [edges[i], edges[i+1])
+                and labelled "start..end". Overrides `grain`.
+        """
+        if edges is not None:
+            edges = sorted(edges)
+            return OrderedDict(
+                (f"{a.isoformat()}..{b.isoformat()}", self.total(a, b)) for a, b in zip(edges, edges[1:])
+            )
+        if grain not in GRAINS:
+            raise ValueError(f"grain must be one of {GRAINS}")
+        if not (1 <= fy_start_month <= 12):
+            raise ValueError("fy_start_month must be between 1 and 12")
+
+        out = OrderedDict()
+        if not self.days:
+            return out
+        start = _bucket_start(self.first_day, grain, fy_start_month)
+        last = self.last_day
+        while start <= last:
+            end = _next_bucket(start, grain)
+            out[_bucket_label(start, grain, fy_start_month)] = self.total(start, end)
+            start = end
+        return out
+
+    def save(self, path):
+        """Write the index (and its metadata) to `path` atomically."""
+        meta = json.dumps(self.meta).encode("utf-8")
+        days, cumsum = self.days, self.cumsum
+        if sys.byteorder != "little":
+            days, cumsum = array(DAY_TYPECODE, days), array(AMOUNT_TYPECODE, cumsum)
+            days.byteswap()
+            cumsum.byteswap()
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(_HEADER.pack(_MAGIC, len(days), len(meta)))
+            fh.write(meta)
+            days.tofile(fh)
+            cumsum.tofile(fh)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as fh:
+            header = fh.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"{path}: not a sales index")
+            magic, count, meta_len = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError(f"{path}: not a sales index")
+            meta = json.loads(fh.read(meta_len).decode("utf-8") or "{}")
+            days = array(DAY_TYPECODE)
+            cumsum = array(AMOUNT_TYPECODE)
+            try:
+                days.fromfile(fh, count)
+                cumsum.fromfile(fh, count + 1)
+            except EOFError:
+                raise ValueError(f"{path}: truncated sales index") from None
+        if sys.byteorder != "little":
+            days.byteswap()
+            cumsum.byteswap()
+        return cls(days, cumsum, meta)
+
+
+def source_stamp(paths):
+    """Identify input files by (path, size, mtime) so a saved index can be checked for staleness."""
+    stamp = []
+    for p in paths:
+        st = os.stat(p)
+        stamp.append([os.path.abspath(p), st.st_size, st.st_mtime_ns])
+    return stamp
+
+
+def test_total_and_rollup():
+    import random
+    import tempfile
+
+    from sales_records import SalesRecords
+
+    rng = random.Random(3)
+    base = date(2023, 11, 20).toordinal()
+    rows = [(date.fromordinal(base + rng.randrange(500)), round(rng.uniform(-50, 500), 2)) for _ in range(3000)]
+    index = DailyIndex.from_records(SalesRecords.from_rows(rows), meta={"source": "test"})
+
+    def brute(start, end):
+        return sum(a for d, a in rows if (start is None or d >= start) and (end is None or d < end))
+
+    for _ in range(300):
+        a, b = sorted(date.fromordinal(base - 10 + rng.randrange(520)) for _ in range(2))
+        assert abs(index.total(a, b) - brute(a, b)) < 1e-6, (a, b)
+    assert abs(index.total() - brute(None, None)) < 1e-6
+    assert index.total(date(2030, 1, 1), date(2020, 1, 1)) == 0.0
+
+    for grain in GRAINS:
+        for fy_start in (1, 4):
+            buckets = index.rollup(grain, fy_start_month=fy_start)
+            expected = OrderedDict()
+            for d, amount in sorted(rows):
+                key = _bucket_label(_bucket_start(d, grain, fy_start), grain, fy_start)
+                expected[key] = expected.get(key, 0.0) + amount
+            nonzero = OrderedDict((k, v) for k, v in buckets.items() if k in expected)
+            assert list(nonzero) == list(expected), grain
+            assert all(abs(nonzero[k] - expected[k]) < 1e-6 for k in expected), grain
+            assert all(v == 0.0 for k, v in buckets.items() if k not in expected), grain
+    edges = [date(2024, 1, 1), date(2024, 2, 15), date(2024, 6, 1)]
+    assert list(index.rollup(edges=edges).values()) == [index.total(a, b) for a, b in zip(edges, edges[1:])]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sales.idx")
+        index.save(path)
+        loaded = DailyIndex.load(path)
+        assert list(loaded.days) == list(index.days) and list(loaded.cumsum) == list(index.cumsum)
+        assert loaded.meta == {"source": "test"}
+        with open(path, "r+b") as fh:
+            fh.truncate(_HEADER.size + 20)
+        try:
+            DailyIndex.load(path)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("truncated index loaded")
+
+
+def run_tests():
+    test_total_and_rollup()
+    print("모든 테스트 통과")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        run_tests()
+    else:
+        print(__doc__)
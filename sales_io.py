@@ -0,0 +1,145 @@
+"""
+Input helpers shared by sales.py, analyze_sales.py, sales_server.py and sales_analytics.py.
+
+A sales input may be a single CSV, a glob ("exports/2025-*.csv.gz") or a
+directory of shards. Shards may be plain or compressed (.gz, .bz2, .xz, .zst)
+and are decompressed as a stream while reading. Multi-shard inputs are read in
+a process pool; results always come back in sorted path order and monthly sums
+are merged with math.fsum, so the totals do not depend on shard order.
+
+Monthly Year/Month tables may also come as a Parquet dataset directory as
+written by awx-lab/py/sales_store.py (dw_sales.parquet/); read_dataset_month_sums()
+reads the version its _CURRENT pointer names (pyarrow is imported on use).
+"""
+import bz2
+import glob
+import gzip
+import io
+import lzma
+import math
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import csv_scan
+from sales_records import SalesRecords
+
+# file name endings picked up when a directory is given
+SHARD_SUFFIXES = (".csv", ".csv.gz", ".csv.bz2", ".csv.xz", ".csv.zst")
+# file in a Parquet dataset directory naming its current, complete version
+DATASET_POINTER = "_CURRENT"
+
+
+def expand_inputs(spec):
+    """
+    Expand a path, glob or directory (or a list of them) to a sorted list of files.
+
+    Plain paths are returned as-is even if they don't exist, so callers can
+    report FileNotFoundError; globs and directories only yield existing files.
+    """
+    specs = [spec] if isinstance(spec, (str, os.PathLike)) else list(spec)
+    paths = set()
+    for s in specs:
+        s = os.fspath(s)
+        if os.path.isdir(s):
+            for root, _, files in os.walk(s):
+                paths.update(os.path.join(root, name) for name in files if name.lower().endswith(SHARD_SUFFIXES))
+        elif glob.has_magic(s):
+            paths.update(p for p in glob.glob(s, recursive=True) if os.path.isfile(p))
+        else:
+            paths.add(s)
+    return sorted(paths)
+
+
+def is_compressed(path):
+    return path.lower().endswith((".gz", ".bz2", ".xz", ".zst"))
+
+
+def open_text(path, encoding="utf-8"):
+    """Open a (possibly compressed) CSV for streaming text reads, picking the codec from the extension."""
+    lower = path.lower()
+    if lower.endswith(".gz"):
+        return gzip.open(path, "rt", encoding=encoding, newline="")
+    if lower.endswith(".bz2"):
+        return bz2.open(path, "rt", encoding=encoding, newline="")
+    if lower.endswith(".xz"):
+        return lzma.open(path, "rt", encoding=encoding, newline="")
+    if lower.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(f"reading {path} requires the 'zstandard' package") from None
+        raw = open(path, "rb")
+        try:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        except Exception:
+            raw.close()
+            raise
+        return io.TextIOWrapper(stream, encoding=encoding, newline="")
+    return open(path, newline="", encoding=encoding)
+
+
+def is_dataset(path):
+    """True for a Parquet dataset directory (name ending in .parquet, or holding a _CURRENT pointer)."""
+    path = os.fspath(path)
+    return os.path.isdir(path) and (
+        path.rstrip("/\\").lower().endswith(".parquet") or os.path.exists(os.path.join(path, DATASET_POINTER))
+    )
+
+
+def dataset_source(path):
+    """Directory with the current files of a dataset: the version _CURRENT names, else `path` itself."""
+    try:
+        with open(os.path.join(path, DATASET_POINTER), encoding="utf-8") as fh:
+            version = fh.read().strip()
+    except FileNotFoundError:
+        return path
+    return os.path.join(path, version)
+
+
+def read_dataset_month_sums(path):
+    """Return OrderedDict[YYYY-MM] = summed amount of a Year/Month/amount Parquet dataset."""
+    try:
+        import pyarrow.dataset as ds
+    except ImportError:
+        raise ImportError(f"reading {path} requires the 'pyarrow' package") from None
+    dataset = ds.dataset(dataset_source(path), format="parquet", partitioning="hive")
+    names = dataset.schema.names
+    found = csv_scan.detect_month_columns(names)
+    if found is None:
+        raise ValueError(f"{path}: expected Year, Month and amount columns, got {names}")
+    columns = [names[i] for i in found]
+    table = dataset.to_table(columns=columns)
+    months = {}
+    for year, month, amount in zip(*(table.column(c).to_pylist() for c in columns)):
+        if year is None or month is None:
+            continue
+        key = f"{int(year):04d}-{int(month):02d}"
+        months[key] = months.get(key, 0.0) + (amount or 0.0)
+    return OrderedDict(sorted(months.items()))
+
+
+def map_shards(func, paths, workers=None):
+    """Return [func(path) for path in paths], run in a process pool when there are several paths."""
+    paths = list(paths)
+    if len(paths) <= 1 or (workers is not None and workers <= 1):
+        return [func(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(paths))) as pool:
+        return list(pool.map(func, paths))
+
+
+def merge_month_sums(parts):
+    """Merge several {YYYY-MM: sum} mappings into one chronological OrderedDict (order-independent)."""
+    values = {}
+    for part in parts:
+        for key, amount in part.items():
+            values.setdefault(key, []).append(amount)
+    return OrderedDict((key, math.fsum(values[key])) for key in sorted(values))
+
+
+def concat_records(parts):
+    """Concatenate SalesRecords shards (in the given order) into one SalesRecords."""
+    out = SalesRecords()
+    for part in parts:
+        out.extend_arrays(part.days, part.amounts)
+    return out
@@ -0,0 +1,233 @@
+"""
+Compact columnar storage for (date, amount) sales rows.
+
+A list of (datetime.date, float) tuples costs well over 100 bytes per row.
+SalesRecords keeps the same data in two contiguous arrays instead: dates as
+int32 day ordinals (date.toordinal()) and amounts as float64, i.e. 12 bytes
+per row. It is shared by sales.py and analyze_sales.py.
+
+Usage:
+  records = SalesRecords()
+  records.append(date(2025, 1, 3), 100.5)
+  records.extend_arrays(ordinals, amounts)      # append a chunk
+  head = records[:1000]                         # zero-copy view
+  np.frombuffer(records.amounts, dtype="f8")    # zero-copy for NumPy
+  for d, amt in records: ...                    # still iterates as (date, amount)
+
+Note: like array.array, a SalesRecords cannot grow while a view or memoryview
+of it is alive (BufferError); drop the views before appending.
+
+  python sales_records.py test
+"""
+from array import array
+from collections import OrderedDict
+from datetime import date
+
+DAY_TYPECODE = "i"      # int32 day ordinal
+AMOUNT_TYPECODE = "d"   # float64
+
+
+def _as_array(typecode, values):
+    """Return `values` as array(typecode), copying only when needed."""
+    if isinstance(values, array) and values.typecode == typecode:
+        return array(typecode, values)
+    try:
+        view = memoryview(values)  # NumPy arrays, other buffers
+    except TypeError:
+        return array(typecode, values)
+    if view.format.lstrip("@=") == typecode:
+        out = array(typecode)
+        out.frombytes(view.cast("B") if view.c_contiguous else view.tobytes())
+        return out
+    # other item types: tolist() converts in C instead of one buffer element at a time
+    return array(typecode, view.tolist())
+
+
+class SalesRecords:
+    """Sequence of (date, amount) rows stored as int32 day ordinals + float64 amounts."""
+
+    __slots__ = ("_days", "_amounts")
+
+    def __init__(self, days=None, amounts=None):
+        # days/amounts are array.array for owning instances, memoryview for views
+        self._days = array(DAY_TYPECODE) if days is None else days
+        self._amounts = array(AMOUNT_TYPECODE) if amounts is None else amounts
+        if len(self._days) != len(self._amounts):
+            raise ValueError("days and amounts must have the same length")
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from an iterable of (date, amount)."""
+        records = cls()
+        records.extend(rows)
+        return records
+
+    @classmethod
+    def from_arrays(cls, days, amounts):
+        """Build from day ordinals and amounts (any iterable or matching buffer); data is copied."""
+        return cls(_as_array(DAY_TYPECODE, days), _as_array(AMOUNT_TYPECODE, amounts))
+
+    @property
+    def is_view(self):
+        return isinstance(self._days, memoryview)
+
+    @property
+    def days(self):
+        """Zero-copy memoryview of the int32 day ordinals."""
+        return memoryview(self._days)
+
+    @property
+    def amounts(self):
+        """Zero-copy memoryview of the float64 amounts."""
+        return memoryview(self._amounts)
+
+    @property
+    def nbytes(self):
+        return len(self) * (self.days.itemsize + self.amounts.itemsize)
+
+    def _check_owner(self):
+        if self.is_view:
+            raise TypeError("cannot append to a SalesRecords view; use copy() first")
+
+    def append(self, d, amount):
+        self._check_owner()
+        # convert both first so a bad value can't leave the arrays different lengths
+        ordinal, amount = d.toordinal(), float(amount)
+        self._days.append(ordinal)
+        self._amounts.append(amount)
+
+    def extend(self, rows):
+        """Append an iterable of (date, amount); nothing is appended if a row is invalid."""
+        self._check_owner()
+        days = array(DAY_TYPECODE)
+        amounts = array(AMOUNT_TYPECODE)
+        for d, amount in rows:
+            ordinal, amount = d.toordinal(), float(amount)
+            days.append(ordinal)
+            amounts.append(amount)
+        self._days.extend(days)
+        self._amounts.extend(amounts)
+
+    def extend_arrays(self, days, amounts):
+        """Append a chunk of day ordinals and amounts (any iterable or matching buffer)."""
+        self._check_owner()
+        days = _as_array(DAY_TYPECODE, days)
+        amounts = _as_array(AMOUNT_TYPECODE, amounts)
+        if len(days) != len(amounts):
+            raise ValueError("days and amounts must have the same length")
+        self._days.extend(days)
+        self._amounts.extend(amounts)
+
+    def copy(self):
+        return SalesRecords.from_arrays(self._days, self._amounts)
+
+    def __len__(self):
+        return len(self._days)
+
+    def __iter__(self):
+        fromordinal = date.fromordinal
+        for d, amount in zip(self._days, self._amounts):
+            yield fromordinal(d), amount
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SalesRecords(memoryview(self._days)[index], memoryview(self._amounts)[index])
+        return date.fromordinal(self._days[index]), self._amounts[index]
+
+    def __repr__(self):
+        kind = "view" if self.is_view else "owner"
+        return f"<SalesRecords {len(self)} rows ({kind}, {self.nbytes} bytes)>"
+
+    def day_sums(self):
+        """Return {day ordinal: summed amount}."""
+        sums = {}
+        get = sums.get
+        for d, amount in zip(self._days, self._amounts):
+            sums[d] = get(d, 0.0) + amount
+        return sums
+
+    def month_sums(self):
+        """Return OrderedDict[YYYY-MM] = summed amount, in chronological order."""
+        sums = {}
+        for d, amount in sorted(self.day_sums().items()):
+            dt = date.fromordinal(d)
+            key = f"{dt.year:04d}-{dt.month:02d}"
+            sums[key] = sums.get(key, 0.0) + amount
+        return OrderedDict(sums)
+
+
+def test_sales_records():
+    rows = [(date(2025, 1, 1 + i % 28), float(i)) for i in range(100)]
+    records = SalesRecords.from_rows(rows)
+    assert list(records) == rows and len(records) == 100 and not records.is_view
+    assert records.nbytes == 100 * 12
+
+    # slices are zero-copy views of the owner
+    view = records[10:20:2]
+    assert view.is_view and list(view) == rows[10:20:2]
+    assert view[1] == rows[12] and list(view[1:3]) == rows[12:16:2]
+    try:
+        view.append(date(2025, 2, 1), 1.0)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("appended to a view")
+    copy = view.copy()
+    assert not copy.is_view and list(copy) == list(view)
+
+    # the owner can't grow while a view (or memoryview) of it is alive
+    try:
+        records.append(date(2025, 2, 1), 1.0)
+    except BufferError:
+        pass
+    else:
+        raise AssertionError("owner grew under a live view")
+    del view
+    records.append(date(2025, 2, 1), 1.0)
+    assert len(records) == 101
+
+    # a bad value appends nothing and leaves days/amounts the same length
+    for bad in ([(date(2025, 3, 1), "x")], [(date(2025, 3, 1), 1.0), (date(2025, 3, 2), "x")]):
+        try:
+            records.extend(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"accepted {bad!r}")
+    try:
+        records.append(date(2025, 3, 1), "x")
+    except ValueError:
+        pass
+    assert len(records) == 101 and len(records.days) == len(records.amounts) == 101
+    assert list(records[:]) == rows + [(date(2025, 2, 1), 1.0)]
+
+    # chunks from arrays, memoryviews and (when installed) NumPy buffers
+    records.extend_arrays(array(DAY_TYPECODE, [date(2025, 4, 1).toordinal()]), memoryview(array("d", [2.5])))
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        days = np.array([date(2025, 5, 1).toordinal()] * 3, dtype=np.int32)
+        records.extend_arrays(days, np.array([1.0, 2.0, 3.0]))
+        records.extend_arrays(days[::2].astype(np.int64), np.array([4.0, 5.0]))
+        assert records.month_sums()["2025-05"] == 15.0
+    try:
+        records.extend_arrays([1, 2], [1.0])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("accepted arrays of different lengths")
+    assert records.month_sums()["2025-04"] == 2.5
+
+
+def run_tests():
+    test_sales_records()
+    print("모든 테스트 통과")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        run_tests()
@@ -0,0 +1,402 @@
+"""
+Serve live monthly sales totals over a local HTTP API.
+
+The service watches sales CSVs (a path, glob or directory, as in
+analyze_sales.py), reads only the rows appended since the last poll and keeps
+the monthly totals up to date. GET /monthly returns them as JSON with an ETag,
+so dashboards can poll with If-None-Match and get a bodiless 304 while nothing
+changed.
+
+Three layouts are understood:
+  - date/amount rows, detected like analyze_sales.read_sales (sales.csv, exports)
+  - monthly tables with Year / Month / amount columns (awx-lab dw_sales.csv)
+  - Year-partitioned Parquet datasets written by awx-lab/py/sales_store.py
+    (dw_sales.parquet/, needs pyarrow); re-read whenever the version pointer
+    or any of the current version's files change
+
+Usage examples:
+  python sales_server.py --file sales.csv
+  python sales_server.py --file awx-lab/py/dw_sales.parquet --port 8765 --interval 5
+  curl -i http://127.0.0.1:8765/monthly
+  python sales_server.py test
+"""
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import csv_scan
+import sales_io
+from analyze_sales import parse_amount, parse_amounts_bulk, parse_dates_bulk
+
+
+def _detect_layout(header):
+    """Return ("ym", year_idx, month_idx, amount_idx) for Year/Month tables, else ("date", ...) like read_sales."""
+    found = csv_scan.detect_month_columns(header)
+    if found is not None:
+        return ("ym",) + found
+    has_header, date_idx, amt_idx = csv_scan.detect_columns(header)
+    return "date", has_header, date_idx, amt_idx
+
+
+# bytes hashed at the start of a file and just before the read offset to notice in-place rewrites
+SIGNATURE_BYTES = 4096
+
+
+class _FileState:
+    """Read position and per-month contribution of one watched file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.ident = None  # (st_dev, st_ino) to notice replaced files
+        self.mtime = None
+        self.signature = None  # hash of the head and of the bytes before offset
+        self.layout = None
+        self.months = {}
+
+    def reset(self):
+        self.offset = 0
+        self.signature = None
+        self.layout = None
+        self.months = {}
+
+    def _add_rows(self, rows):
+        if not rows:
+            return
+        if self.layout is None:
+            self.layout = _detect_layout(rows[0])
+            if self.layout[0] == "ym" or self.layout[1]:  # header row
+                rows = rows[1:]
+        kind, a, b, c = self.layout
+        if kind == "ym":
+            for row in rows:
+                try:
+                    year, month = int(row[a]), int(row[b])
+                    amount = parse_amount(row[c]) if c < len(row) else 0.0
+                except (ValueError, IndexError):
+                    continue
+                key = f"{year:04d}-{month:02d}"
+                self.months[key] = self.months.get(key, 0.0) + amount
+            return
+        date_idx, amt_idx = b, c
+        raw_dates = [r[date_idx] if date_idx is not None and date_idx < len(r) else "" for r in rows]
+        raw_amts = [r[amt_idx] if amt_idx is not None and amt_idx < len(r) else "" for r in rows]
+        for ordinal, amount in zip(parse_dates_bulk(raw_dates), parse_amounts_bulk(raw_amts)):
+            if ordinal is None:
+                continue
+            d = date.fromordinal(ordinal)
+            key = f"{d.year:04d}-{d.month:02d}"
+            self.months[key] = self.months.get(key, 0.0) + amount
+
+    def _signature(self, fh, offset):
+        fh.seek(0)
+        h = hashlib.sha1(fh.read(min(offset, SIGNATURE_BYTES)))
+        start = max(0, offset - SIGNATURE_BYTES)
+        fh.seek(start)
+        h.update(fh.read(offset - start))
+        return h.digest()
+
+    def _appended(self, st):
+        """True if the file only grew since the last read (same file, unchanged content up to offset)."""
+        if self.offset == 0:
+            return True  # nothing read yet
+        if (st.st_dev, st.st_ino) != self.ident or st.st_size < self.offset:
+            return False
+        if sales_io.is_compressed(self.path) or (self.layout and self.layout[0] == "ym"):
+            # compressed streams can't be tailed; Year/Month rows replace months instead of adding
+            return False
+        with open(self.path, "rb") as fh:
+            return self._signature(fh, self.offset) == self.signature
+
+    def poll(self):
+        """Consume new complete lines; return True if this file's totals may have changed."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            changed = bool(self.months)
+            self.reset()
+            self.ident = self.mtime = None
+            return changed
+        if (st.st_dev, st.st_ino) == self.ident and st.st_size == self.offset and st.st_mtime_ns == self.mtime:
+            return False
+        changed = False
+        if not self._appended(st):
+            # new, replaced, truncated or rewritten in place (e.g. df.to_csv): start over
+            changed = bool(self.months)
+            self.reset()
+        self.ident = (st.st_dev, st.st_ino)
+        self.mtime = st.st_mtime_ns
+
+        if sales_io.is_compressed(self.path):
+            with sales_io.open_text(self.path) as fh:
+                self._add_rows([row for row in csv.reader(fh) if row])
+            self.offset = st.st_size
+            return True
+
+        with open(self.path, "rb") as fh:
+            fh.seek(self.offset)
+            data = fh.read(st.st_size - self.offset)
+            end = data.rfind(b"\n") + 1  # only complete lines; a partial last line waits for the next poll
+            if end:
+                self.offset += end
+                self.signature = self._signature(fh, self.offset)
+        if end == 0:
+            return changed
+        self._add_rows([row for row in csv.reader(data[:end].decode("utf-8").splitlines()) if row])
+        return True
+
+
+class _DatasetState:
+    """Per-month totals of a Parquet dataset directory, re-read when its files change."""
+
+    def __init__(self, path):
+        self.path = path
+        self.stamp = None
+        self.months = {}
+
+    def _stamp(self, source):
+        files = []
+        for root, _, names in os.walk(source):
+            for name in names:
+                if name.endswith(".parquet"):
+                    st = os.stat(os.path.join(root, name))
+                    files.append((os.path.relpath(os.path.join(root, name), source), st.st_size, st.st_mtime_ns))
+        return source, sorted(files)
+
+    def poll(self):
+        """Re-read the dataset if its current files changed; return True if so."""
+        if not os.path.isdir(self.path):
+            changed = bool(self.months)
+            self.stamp, self.months = None, {}
+            return changed
+        # sales_store datasets name their complete version in _CURRENT
+        stamp = self._stamp(sales_io.dataset_source(self.path))
+        if stamp == self.stamp:
+            return False
+        self.months = dict(sales_io.read_dataset_month_sums(stamp[0]))
+        self.stamp = stamp
+        return True
+
+
+class MonthlyAggregator:
+    """Incrementally maintained monthly totals over a set of watched sales files."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.files = {}
+        self.lock = threading.Lock()
+        self._body = None
+        self._etag = None
+        self.refresh()
+
+    def refresh(self):
+        """Pick up new/removed files and appended rows; return True if the totals changed."""
+        specs = [self.spec] if isinstance(self.spec, (str, os.PathLike)) else list(self.spec)
+        datasets = [os.fspath(s) for s in specs if sales_io.is_dataset(s)]
+        others = [s for s in specs if os.fspath(s) not in datasets]
+        paths = [p for p in sales_io.expand_inputs(others) if os.path.exists(p)] if others else []
+        changed = False
+        for path in set(self.files) - set(paths) - set(datasets):
+            changed |= bool(self.files.pop(path).months)
+        for path in datasets:
+            changed |= self.files.setdefault(path, _DatasetState(path)).poll()
+        for path in paths:
+            state = self.files.setdefault(path, _FileState(path))
+            changed |= state.poll()
+        if changed or self._body is None:
+            self._publish()
+        return changed
+
+    def monthly(self):
+        parts = {}
+        for state in self.files.values():
+            for key, amount in state.months.items():
+                parts.setdefault(key, []).append(amount)
+        return [(key, math.fsum(parts[key])) for key in sorted(parts)]
+
+    def _publish(self):
+        months = [
+            {"ym": key, "year": int(key[:4]), "month": int(key[5:]), "amount": round(amount, 6)}
+            for key, amount in self.monthly()
+        ]
+        body = json.dumps({"months": months, "files": len(self.files)}, ensure_ascii=False).encode("utf-8")
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:20]
+        with self.lock:
+            self._body, self._etag = body, etag
+
+    def snapshot(self):
+        """Return (etag, json body bytes) of the current totals."""
+        with self.lock:
+            return self._etag, self._body
+
+
+def make_handler(aggregator):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_HEAD(self):
+            self.do_GET(head=True)
+
+        def do_GET(self, head=False):
+            self._head = head
+            path = self.path.split("?", 1)[0]
+            if path == "/healthz":
+                self._send(200, b"ok", "text/plain")
+                return
+            if path not in ("/", "/monthly"):
+                self._send(404, b'{"error": "not found"}')
+                return
+            etag, body = aggregator.snapshot()
+            if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self._send(200, body, etag=etag)
+
+        def _send(self, status, body, content_type="application/json; charset=utf-8", etag=None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-cache")
+            if etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            if not self._head:
+                self.wfile.write(body)
+
+    return Handler
+
+
+def serve(spec, host="127.0.0.1", port=8765, interval=2.0):
+    """Watch `spec` every `interval` seconds and serve /monthly until interrupted."""
+    aggregator = MonthlyAggregator(spec)
+    server = ThreadingHTTPServer((host, port), make_handler(aggregator))
+    stop = threading.Event()
+
+    def watch():
+        while not stop.wait(interval):
+            try:
+                aggregator.refresh()
+            except Exception as e:  # keep serving the last good totals
+                print(f"refresh failed: {e}", file=sys.stderr)
+
+    threading.Thread(target=watch, daemon=True).start()
+    print(f"Serving monthly totals of {spec} on http://{host}:{server.server_address[1]}/monthly", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve live monthly sales totals as JSON over HTTP.")
+    parser.add_argument("--file", "-f", default="sales.csv", help="Sales CSV path, glob, directory or Parquet dataset directory (default: sales.csv).")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1).")
+    parser.add_argument("--port", "-p", type=int, default=8765, help="Port (default: 8765).")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between file polls (default: 2).")
+    args = parser.parse_args(argv)
+    serve(args.file, args.host, args.port, args.interval)
+    return 0
+
+
+def test_monthly_aggregator():
+    import shutil
+    import tempfile
+    import time
+
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, "sales.csv")
+
+        def write(text, mode="w"):
+            with open(path, mode, encoding="utf-8", newline="") as fh:
+                fh.write(text)
+
+        write("date,amount\n2024-01-05,10\n2024-02-01,5\n")
+        agg = MonthlyAggregator(path)
+        assert agg.monthly() == [("2024-01", 10.0), ("2024-02", 5.0)]
+        assert not agg.refresh()
+
+        # append, including a partial last line that waits for its newline
+        write("2024-02-03,7\n2024-03-0", "a")
+        assert agg.refresh() and agg.monthly() == [("2024-01", 10.0), ("2024-02", 12.0)]
+        write("1,1\n", "a")
+        assert agg.refresh() and agg.monthly()[-1] == ("2024-03", 1.0)
+
+        # in-place rewrite: same inode, larger file, an earlier row changed
+        time.sleep(0.01)
+        write("date,amount\n2024-01-05,99\n2024-02-01,5\n2024-02-03,7\n2024-03-01,1\n2024-04-01,2\n")
+        assert agg.refresh()
+        assert agg.monthly() == [("2024-01", 99.0), ("2024-02", 12.0), ("2024-03", 1.0), ("2024-04", 2.0)]
+
+        # truncate
+        write("date,amount\n2024-05-01,3\n")
+        assert agg.refresh() and agg.monthly() == [("2024-05", 3.0)]
+
+        # replace with a new file (new inode)
+        with open(path + ".new", "w", encoding="utf-8") as fh:
+            fh.write("date,amount\n2024-06-01,4\n")
+        os.replace(path + ".new", path)
+        assert agg.refresh() and agg.monthly() == [("2024-06", 4.0)]
+
+        # Year/Month tables are re-read in full: rows replace months
+        ym = os.path.join(tmp, "dw_sales.csv")
+        with open(ym, "w", encoding="utf-8") as fh:
+            fh.write("Year,Month,SalesAmount\n2024,1,100\n2024,2,200\n")
+        agg = MonthlyAggregator(ym)
+        time.sleep(0.01)
+        with open(ym, "w", encoding="utf-8") as fh:
+            fh.write("Year,Month,SalesAmount\n2024,1,100\n2024,2,250\n2024,3,300\n")
+        assert agg.refresh() and agg.monthly() == [("2024-01", 100.0), ("2024-02", 250.0), ("2024-03", 300.0)]
+
+        # HTTP: 200 with an ETag, 304 for a matching If-None-Match, new ETag after a change
+        import urllib.error
+        import urllib.request
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(agg))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/monthly"
+        try:
+            with urllib.request.urlopen(url) as resp:
+                etag = resp.headers["ETag"]
+                assert json.load(resp)["months"][1] == {"ym": "2024-02", "year": 2024, "month": 2, "amount": 250.0}
+            try:
+                urllib.request.urlopen(urllib.request.Request(url, headers={"If-None-Match": etag}))
+            except urllib.error.HTTPError as e:
+                assert e.code == 304 and e.headers["ETag"] == etag
+            else:
+                raise AssertionError("expected 304")
+            with open(ym, "a", encoding="utf-8") as fh:
+                fh.write("2024,4,1\n")
+            agg.refresh()
+            with urllib.request.urlopen(urllib.request.Request(url, headers={"If-None-Match": etag})) as resp:
+                assert resp.status == 200 and resp.headers["ETag"] != etag
+        finally:
+            server.shutdown()
+            server.server_close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def run_tests():
+    test_monthly_aggregator()
+    print("모든 테스트 통과")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        run_tests()
+    else:
+        sys.exit(main())